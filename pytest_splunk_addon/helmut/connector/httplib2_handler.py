@@ -6,10 +6,12 @@ import httplib2
 import logging
 import time
 import random
+import queue
 from io import BytesIO
 from http.client import ResponseNotReady
 
 RETRIES = 3
+DEFAULT_POOL_SIZE = 4
 
 
 def sdk_request_adapter(url, message, **kwargs):
@@ -27,10 +29,79 @@ def sdk_request_adapter(url, message, **kwargs):
         - headers: A list of pairs containing the response headers (for example, ``[('key': value), ...]``).
         - body: A stream-like object supporting ``read(size=None)`` and ``close()`` methods to get the body of the response.
     """
+    return _request(_create_http(), url, message)
+
+
+class PooledHttpHandler(object):
+    """
+    An SDK request handler which reuses the connections between requests.
+
+    The SDK's default handler and L{sdk_request_adapter} open a new
+    connection, and do a new TLS handshake, for every request. The handler
+    keeps a pool of httplib2.Http objects instead, each of which keeps its
+    connection to splunkd alive. As httplib2.Http is not thread safe, a
+    request checks an object out of the pool for its duration. When the
+    pool is empty a new object is created, and when it is full the object
+    returned to it is closed, so at most C{pool_size} idle connections are
+    kept alive.
+
+    @ivar pool_size: The maximum number of idle connections kept alive
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOL_SIZE):
+        """
+        @param pool_size: The maximum number of idle connections kept alive
+        @type pool_size: int
+        """
+        self.pool_size = pool_size
+        self._pool = queue.LifoQueue(maxsize=pool_size)
+
+    def __call__(self, url, message, **kwargs):
+        """
+        Same as L{sdk_request_adapter} but makes the request on a pooled
+        connection.
+        """
+        http = self._acquire()
+        try:
+            return _request(http, url, message)
+        finally:
+            self._release(http)
+
+    def _acquire(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            return _create_http()
+
+    def _release(self, http):
+        try:
+            self._pool.put_nowait(http)
+        except queue.Full:
+            http.close()
+
+    def close(self):
+        """
+        Closes all the idle connections of the pool.
+        """
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+def _create_http():
+    return httplib2.Http(disable_ssl_certificate_validation=True)
+
+
+def _request(h, url, message):
+    """
+    Makes the request of an SDK message with the given httplib2.Http object
+    and converts the response to the format the SDK expects.
+    """
     method = message.get("method", "GET").upper()
     body = message.get("body", "") if method == "POST" else None
     headers = dict(message.get("headers", []))
-    h = httplib2.Http(disable_ssl_certificate_validation=True)
     for i in range(RETRIES):
         try:
             resp, content = h.request(url, method=method, body=body, headers=headers)
@@ -11,6 +11,7 @@ from splunklib.binding import _NoAuthenticationToken, AuthenticationError
 from splunklib.client import Service, Endpoint
 
 from .base import Connector
+from .httplib2_handler import PooledHttpHandler
 
 
 class SDKConnector(Connector):
@@ -64,6 +65,7 @@ class SDKConnector(Connector):
         sharing=DEFAULT_SHARING,
         owner=None,
         app=None,
+        pool_size=None,
     ):
         """
         Creates a new connector.
@@ -87,6 +89,11 @@ class SDKConnector(Connector):
         @type owner: str
         @param app: used by python sdk service
         @type app: str
+        @param pool_size: The number of idle keep-alive connections shared
+                          by the requests of the connector. If None (default)
+                          or 0 the handler of the SDK is used, which opens a
+                          new connection for every request.
+        @type pool_size: int
         """
 
         super(SDKConnector, self).__init__(
@@ -104,7 +111,11 @@ class SDKConnector(Connector):
             sharing  # accepting None value, so SDK takes owner and app blindly.
         )
 
-        self._service = Service(handler=self.DEFAULT_HANDLER, **self._service_arguments)
+        # The pool outlives the services recreated when Splunk restarts
+        self._handler = (
+            PooledHttpHandler(pool_size) if pool_size else self.DEFAULT_HANDLER
+        )
+        self._service = Service(handler=self._handler, **self._service_arguments)
         splunk.register_start_listener(self._recreate_service)
 
         # TODO: TEMPORARY FOR EST-1859
@@ -178,7 +189,7 @@ class SDKConnector(Connector):
         @return: The newly created Service
         @rtype: Service
         """
-        return Service(handler=self.DEFAULT_HANDLER, **self._service_arguments)
+        return Service(handler=self._handler, **self._service_arguments)
 
     @property
     def service(self):
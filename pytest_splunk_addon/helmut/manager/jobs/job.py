@@ -20,6 +20,9 @@ class Job(ItemFromManager):
     """
 
     _SECONDS_BETWEEN_JOB_IS_DONE_CHECKS = 1
+    _INITIAL_SECONDS_BETWEEN_JOB_IS_DONE_CHECKS = 0.05
+    _JOB_IS_DONE_CHECKS_BACKOFF_FACTOR = 2
+    _RESULTS_PAGE_SIZE = 1000
 
     @abstractmethod
     def get_results(self, **kwargs):
@@ -37,6 +40,17 @@ class Job(ItemFromManager):
     def get_messages(self):
         pass
 
+    @abstractmethod
+    def get_status(self):
+        """
+        Returns the completion status of the job, read with a single request.
+
+        @return: The status with the keys is_done, is_failed, dispatch_state
+                 and messages
+        @rtype: dict
+        """
+        pass
+
     @abstractproperty
     def sid(self):
         pass
@@ -45,6 +59,12 @@ class Job(ItemFromManager):
         """
         Waits for this search to finish.
 
+        The status of the job is polled with an exponential backoff, starting
+        at C{_INITIAL_SECONDS_BETWEEN_JOB_IS_DONE_CHECKS} and capped at
+        C{_SECONDS_BETWEEN_JOB_IS_DONE_CHECKS}. A job created with
+        exec_mode=blocking, Ex, the count checks of SearchUtil, is already
+        done and returns after the first check.
+
         @param timeout: The maximum time to wait in seconds. None or 0
                         means no limit, None is default.
         @type timeout: int
@@ -58,22 +78,80 @@ class Job(ItemFromManager):
             timeout = None
 
         start_time = time.time()
-        while not self.is_done():
-            try:
-                if self.is_failed():
-                    self.logger.warn(
-                        "job %s failed. error message: %s"
-                        % (self.sid, self.get_messages())
-                    )
-                    break
-            except AttributeError as e:
-                self.logger.debug(str(e))
+        seconds_between_checks = self._INITIAL_SECONDS_BETWEEN_JOB_IS_DONE_CHECKS
+        while True:
+            status = self.get_status()
+            if status["is_done"]:
+                break
+            if status["is_failed"]:
+                self.logger.warn(
+                    "job %s failed. error message: %s" % (self.sid, status["messages"])
+                )
+                break
             _check_if_wait_has_timed_out(start_time, timeout)
-            time.sleep(self._SECONDS_BETWEEN_JOB_IS_DONE_CHECKS)
+            time.sleep(seconds_between_checks)
+            seconds_between_checks = min(
+                seconds_between_checks * self._JOB_IS_DONE_CHECKS_BACKOFF_FACTOR,
+                self._SECONDS_BETWEEN_JOB_IS_DONE_CHECKS,
+            )
 
         self.logger.debug("Job %s wait is done." % self.sid)
         return self
 
+    def iter_results(self, count=None, offset=0, **kwargs):
+        """
+        Iterates over the results of the job one page at a time.
+
+        A page is only requested when the previous one has been consumed, so
+        a caller that stops iterating early does not fetch the remaining
+        results.
+
+        @param count: The number of results to request per page. Defaults to
+                      C{_RESULTS_PAGE_SIZE}.
+        @type count: int
+        @param offset: The index of the first result to read.
+        @type offset: int
+        @return: A generator of the results as dicts
+        @rtype: generator
+        """
+        count = count or self._RESULTS_PAGE_SIZE
+        while True:
+            page = self.get_results(count=count, offset=offset, **kwargs)
+            for result in page:
+                yield result
+            if len(page) < count:
+                return
+            offset += count
+
+    def has_any_result(self):
+        """
+        Checks whether the job has at least one result by reading a single
+        result.
+
+        @rtype: bool
+        """
+        for _ in self.iter_results(count=1):
+            return True
+        return False
+
+    def count_results(self, limit):
+        """
+        Counts the results of the job, reading no more than C{limit} of them.
+
+        @param limit: The count at which to stop reading.
+        @type limit: int
+        @return: The number of results, at most C{limit}
+        @rtype: int
+        """
+        count = 0
+        if limit <= 0:
+            return count
+        for _ in self.iter_results(count=min(limit, self._RESULTS_PAGE_SIZE)):
+            count += 1
+            if count >= limit:
+                break
+        return count
+
     def check_message(self):
         if self.get_messages():
             message = self.get_messages()
@@ -88,6 +88,15 @@ class RESTJobWrapper(Job):
         result = self.raw_rest_job.refresh()
         return bool(result["content"]["isFailed"])
 
+    def get_status(self):
+        content = self.raw_rest_job.refresh()["content"]
+        return {
+            "is_done": bool(content.get("isDone")),
+            "is_failed": bool(content.get("isFailed")),
+            "dispatch_state": content.get("dispatchState"),
+            "messages": content.get("messages", {}),
+        }
+
     def is_finalized(self):
         result = self.raw_rest_job.refresh()
         return bool(result["content"]["isFinalized"])
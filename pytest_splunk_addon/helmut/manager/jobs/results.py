@@ -4,7 +4,9 @@
 @since: 2011-11-23
 """
 import copy
+import sys
 from builtins import object
+from types import MappingProxyType
 
 
 class Results(object):
@@ -40,7 +42,13 @@ class Results(object):
 
     As you can see each event in the list doesn't have to contain all fields.
 
+    The events, L{as_list} and L{as_dict} are copies of the results. Use
+    L{get_event_view}, L{iter_event_views}, L{list_view} and L{dict_view}
+    to read the results without copying them.
+
     @ivar _list: The results as a list
+    @ivar _columns_cache: The results in columnar form. You should use the
+                          columns property though!
     @ivar _dict_cached: Since creating the dictionary is expensive it's cached.
                         You should use the _dict property though!
     """
@@ -55,6 +63,7 @@ class Results(object):
         super(Results, self).__init__()
 
         self._list = results_
+        self._columns_cache = None
         self._dict_cache = None
 
     def __repr__(self):
@@ -75,7 +84,30 @@ class Results(object):
         @return: A list of values for that field
         @rtype: list(str)
         """
-        return self.as_dict.get(field)
+        column = self.columns.get_column(field)
+        return None if column is None else copy.deepcopy(list(column))
+
+    def get_values(self, field):
+        """
+        Returns the values for the specified field from the events which
+        have it. Nulls are not included.
+
+        @param field: The field to get
+        @type field: str
+        @return: The values for that field, empty if it doesn't exist
+        @rtype: tuple(str)
+        """
+        return self.columns.get_values(field)
+
+    def count(self, field):
+        """
+        Returns the number of events which have the specified field
+
+        @param field: The field to count
+        @type field: str
+        @rtype: int
+        """
+        return self.columns.count(field)
 
     def __getitem__(self, index):
         """
@@ -84,12 +116,15 @@ class Results(object):
         used when doing this:
             >>> results[index]
 
-        @param index: The index to get
+        This is a copy of the event so you can do whatever you want to do with
+        it.
+
+        @param index: The index to get. A slice returns a list of events.
         @type index: int
         @return: The fields for that event
         @rtype: dict(str: str)
         """
-        return self.as_list[index]
+        return copy.deepcopy(self._list[index])
 
     def get_event(self, index):
         """
@@ -104,11 +139,22 @@ class Results(object):
         """
         return self[index]
 
+    def get_event_view(self, index):
+        """
+        Returns a read-only view of the event at the specified index
+
+        @param index: The index to get
+        @type index: int
+        @return: The event at that index
+        @rtype: MappingProxyType(str: str)
+        """
+        return MappingProxyType(self._list[index])
+
     def __iter__(self):
         """
         Returns an iterator for this result set.
 
-        The iterator will iterate over each event.
+        The iterator will lazily iterate over a copy of each event.
 
         This is used when doing
             >>> for event in results: ...
@@ -116,7 +162,16 @@ class Results(object):
         @return: The iterator
         @rtype: iterator
         """
-        return self.as_list.__iter__()
+        return (copy.deepcopy(event) for event in self._list)
+
+    def iter_event_views(self):
+        """
+        Returns an iterator over a read-only view of each event
+
+        @return: The iterator
+        @rtype: iterator
+        """
+        return (MappingProxyType(event) for event in self._list)
 
     def __contains__(self, field):
         """
@@ -129,7 +184,7 @@ class Results(object):
         @return: True if it exists
         @rtype: bool
         """
-        return field in self._dict
+        return self.columns.count(field) > 0
 
     def __len__(self):
         """
@@ -151,7 +206,7 @@ class Results(object):
 
         @rtype: dict
         """
-        return copy.deepcopy(self._dict)
+        return self.to_dict()
 
     @property
     def as_list(self):
@@ -164,7 +219,52 @@ class Results(object):
 
         @rtype: list
         """
-        return copy.deepcopy(self._list)
+        return self.to_list()
+
+    @property
+    def dict_view(self):
+        """
+        A read-only view of this result set as a dictionary, the values of
+        each field are a tuple.
+
+        @rtype: MappingProxyType
+        """
+        return MappingProxyType(self._dict)
+
+    @property
+    def list_view(self):
+        """
+        A read-only view of this result set as a tuple of read-only events.
+
+        @rtype: tuple
+        """
+        return tuple(self.iter_event_views())
+
+    def to_dict(self):
+        """
+        A copy of this result set as a dictionary. The format is specified in
+        the documentation for the class.
+
+        This is a copy of the results so you can do whatever you want to do with
+        it.
+
+        @rtype: dict
+        """
+        return {field: copy.deepcopy(list(values)) for field, values in self._dict.items()}
+
+    def to_list(self, count=None):
+        """
+        A copy of this result set as a list. The format is specified in the
+        documentation for the class
+
+        This is a copy of the results so you can do whatever you want to do with
+        it.
+
+        @param count: Copy only the first count events. None copies all.
+        @type count: int
+        @rtype: list
+        """
+        return copy.deepcopy(self._list[:count])
 
     @property
     def fields(self):
@@ -176,7 +276,19 @@ class Results(object):
 
         @rtype: list
         """
-        return list(self._dict.keys())
+        return self.columns.fields
+
+    @property
+    def columns(self):
+        """
+        This result set in columnar form, built on first access. The columns
+        refer to the value objects of the rows, the values are not copied.
+
+        @rtype: L{Columns}
+        """
+        if self._columns_cache is None:
+            self._columns_cache = Columns(self._list)
+        return self._columns_cache
 
     @property
     def _dict(self):
@@ -187,68 +299,141 @@ class Results(object):
 
         @rtype: dict
         """
-        if not self._dict_cache:
-            self._dict_cache = _list_to_dictionary(self._list)
+        if self._dict_cache is None:
+            self._dict_cache = self.columns.as_dict()
         return self._dict_cache
 
 
-def _list_to_dictionary(events):
+class Columns(object):
     """
-    Converts a list of events to a dictionary of fields.
+    A columnar store of a result set.
 
-    Input format::
-        [
-            {
-                'field1': value1,
-                'field2': value2,
-                ...
-            },
+    Each field name is interned once and has one array with the values of
+    the events which have the field. A null bitmap per field records which
+    events have the field, so no None padding is stored.
 
-            {
-                'field2': value3,
-                'field3': value4,
-                ...
-            },
+    The store is built in a single pass over the events with L{append}.
 
-            ...
-        ]
+    @ivar _values: The values of each field, without nulls
+    @ivar _bitmaps: The null bitmap of each field. Bit i is set if event i
+                    has the field.
+    @ivar _count: The number of events
+    """
 
-    Output format::
-        {
-            'field1': [value1, None, ...],
-            'field2': [value2, value3, ...],
-            'field3': [None, value4, ...],
-            ...
-        }
+    def __init__(self, events=()):
+        """
+        Constructor
 
-    If not all fields are present in every event None will be inserted instead.
+        @param events: The events to store
+        @type events: iterable(dict(str: str))
+        """
+        super(Columns, self).__init__()
 
-    @param events: The events as a list of dictionaries
-    @type events: list(dict(field(str): value(str)))
+        self._values = {}
+        self._bitmaps = {}
+        self._count = 0
+        for event in events:
+            self.append(event)
 
-    @return: The events as a dictionary.
-    @rtype: dict(field(str): values(list(str)))
-    """
-    fields = _get_fields(events)
-    r = {}
-    for event in events:
-        for field in fields:
-            if not field in r:
-                r[field] = []
-            r[field].append(event.get(field, None))
-    return r
+    def __len__(self):
+        """
+        Returns the number of events in this store
 
+        @rtype: int
+        """
+        return self._count
 
-def _get_fields(events):
-    """
-    Returns a list of all fields in the given event set.
+    def append(self, event):
+        """
+        Adds an event to the columns
 
-    @param events: The events as a list of dictionaries.
-    @type events: list(dict(str: str))
-    @return: All the fields.
-    @rtype: set(str)
-    """
-    fields = set()
-    for event in events:
-        fields.update(list(event.keys()))
-    return fields
+        @param event: The event to add
+        @type event: dict(str: str)
+        """
+        index = self._count
+        byte_index, bit = index >> 3, 1 << (index & 7)
+        for field, value in event.items():
+            values = self._values.get(field)
+            if values is None:
+                field = sys.intern(field)
+                values = self._values[field] = []
+                self._bitmaps[field] = bytearray()
+            bitmap = self._bitmaps[field]
+            if len(bitmap) <= byte_index:
+                bitmap.extend(bytes(byte_index + 1 - len(bitmap)))
+            bitmap[byte_index] |= bit
+            values.append(value)
+        self._count += 1
+
+    @property
+    def fields(self):
+        """
+        The fields in this store
+
+        @rtype: list(str)
+        """
+        return list(self._values.keys())
+
+    def get_values(self, field):
+        """
+        Returns the values of the events which have the field
+
+        @param field: The field to get
+        @type field: str
+        @return: The values, empty if the field doesn't exist
+        @rtype: tuple(str)
+        """
+        return tuple(self._values.get(field, ()))
+
+    def count(self, field):
+        """
+        Returns the number of events which have the field
+
+        @param field: The field to count
+        @type field: str
+        @rtype: int
+        """
+        return len(self._values.get(field, ()))
+
+    def is_null(self, field, index):
+        """
+        Checks if the event at index doesn't have the field
+
+        @param field: The field to check
+        @type field: str
+        @param index: The index of the event
+        @type index: int
+        @rtype: bool
+        """
+        bitmap = self._bitmaps.get(field, b"")
+        byte_index = index >> 3
+        return byte_index >= len(bitmap) or not bitmap[byte_index] & (
+            1 << (index & 7)
+        )
+
+    def get_column(self, field):
+        """
+        Returns the values of the field for every event, None for the
+        events which don't have the field.
+
+        @param field: The field to get
+        @type field: str
+        @return: The column or None if the field doesn't exist
+        @rtype: tuple(str)
+        """
+        if field not in self._values:
+            return None
+        values = iter(self._values[field])
+        return tuple(
+            None if self.is_null(field, index) else next(values)
+            for index in range(self._count)
+        )
+
+    def as_dict(self):
+        """
+        Returns the columns as a dictionary of fields. The format is specified
+        in the documentation of L{Results}.
+
+        @rtype: dict(field(str): values(tuple(str)))
+        """
+        return {field: self.get_column(field) for field in self._values}
@@ -11,12 +11,19 @@ from pytest_splunk_addon.helmut.manager.jobs.sdk.job import SDKJobWrapper
 
 
 class SDKJobsWrapper(Jobs):
+    def __init__(self, connector):
+        super(SDKJobsWrapper, self).__init__(connector)
+        # Time bounds applied to every job unless the job sets its own,
+        # Ex, {"earliest_time": ..., "latest_time": ...}
+        self.time_bounds = {}
+
     @property
     def _service(self):
         return self.connector.service
 
     def create(self, query, **kwargs):
         self.logger.info("Creating job with query: %s" % query)
+        kwargs = dict(self.time_bounds, **kwargs)
         job = self._service.jobs.create(query, **kwargs)
         return SDKJobWrapper(self.connector, job)
 
@@ -5,6 +5,12 @@
 """
 import splunklib.results as results
 
+# JSONResultsReader is only available in the later releases of the SDK
+try:
+    from splunklib.results import JSONResultsReader
+except ImportError:
+    JSONResultsReader = None
+
 from pytest_splunk_addon.helmut.manager.jobs.job import Job
 from pytest_splunk_addon.helmut.manager.jobs.results import Results
 
@@ -60,6 +66,23 @@ class SDKJobWrapper(Job):
     def is_failed(self):
         return self.raw_sdk_job.refresh().content.isFailed == "1"
 
+    def get_status(self):
+        # is_ready refreshes the job, the content is read from that refresh
+        if not self.raw_sdk_job.is_ready():
+            return {
+                "is_done": False,
+                "is_failed": False,
+                "dispatch_state": None,
+                "messages": {},
+            }
+        content = self.raw_sdk_job.content
+        return {
+            "is_done": content.get("isDone") == "1",
+            "is_failed": content.get("isFailed") == "1",
+            "dispatch_state": content.get("dispatchState"),
+            "messages": content.get("messages", {}),
+        }
+
     def is_finalized(self):
         return self.raw_sdk_job.refresh().content.isFinalized == "1"
 
@@ -190,6 +213,32 @@ class SDKJobWrapper(Job):
         response = self.raw_sdk_job.results(**kwargs)
         return _build_results_from_sdk_response(response)
 
+    def iter_results(self, count=None, offset=0, **kwargs):
+        """
+        Iterates over the results of the job one page at a time.
+
+        The pages are requested with output_mode=json so that the results are
+        not parsed from XML, and each page is parsed while it is read.
+
+        @param count: The number of results to request per page.
+        @type count: int
+        @param offset: The index of the first result to read.
+        @type offset: int
+        @return: A generator of the results as dicts
+        @rtype: generator
+        """
+        count = count or self._RESULTS_PAGE_SIZE
+        while True:
+            read = 0
+            for result in _iter_results_from_sdk_job(
+                self.raw_sdk_job, count=count, offset=offset, **kwargs
+            ):
+                read += 1
+                yield result
+            if read < count:
+                return
+            offset += count
+
     def get_search_log(self, **kwargs):
         return self.raw_sdk_job.searchlog(**kwargs)
 
@@ -225,6 +274,20 @@ def _build_results_from_sdk_response(response):
     return Results(events)
 
 
+def _iter_results_from_sdk_job(sdk_job, **kwargs):
+    """
+    Reads a page of results from the SDK and yields them as dicts, the
+    messages of the response are skipped.
+    """
+    if JSONResultsReader is None:
+        reader = results.ResultsReader(sdk_job.results(**kwargs))
+    else:
+        reader = JSONResultsReader(sdk_job.results(output_mode="json", **kwargs))
+    for result in reader:
+        if isinstance(result, dict):
+            yield _build_event_from_results_reader(result)
+
+
 def _build_results_dict_from_sdk_response(response):
     """
     Get results from the SDK and return them.
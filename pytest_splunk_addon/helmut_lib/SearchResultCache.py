@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Provides the cache of the search results of a test session
+"""
+import re
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+# A quoted string of the query or a whitespace outside the quoted strings
+QUOTED_OR_SPACE_REGEX = re.compile(r'("(?:\\.|[^"\\])*")|\s+')
+
+
+class SearchResultCache(object):
+    """
+    Caches the outcome of the searches of a test session, so that a search
+    dispatched again with the same query is not executed on the search head.
+
+    The entries are kept in memory and the least recently used entries are
+    evicted once max_size is reached. If the pytest cache is provided, the
+    entries are persisted in it as well & the next test sessions use them,
+    Ex, reruns with --lf.
+
+    Each entry is a dictionary::
+
+        {
+            "has_results": bool,
+            "results": list of results, None if only the count was checked
+        }
+
+    Args:
+        max_size (int): maximum number of entries kept in memory
+        disk_cache (_pytest.cacheprovider.Cache): The pytest cache (optional)
+        namespace (str): namespace of the keys, Ex, host:port of the Splunk instance
+    """
+
+    DISK_KEY = "pytest-splunk-addon/search_results/{}"
+
+    def __init__(self, max_size=1000, disk_cache=None, namespace=""):
+        self.max_size = max_size
+        self.disk_cache = disk_cache
+        self.namespace = namespace
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_query(query):
+        """
+        Collapse the whitespaces of the query, the quoted strings are kept as is
+
+        Args:
+            query (str): SPL query
+
+        Returns:
+            str: the normalized query
+        """
+        return QUOTED_OR_SPACE_REGEX.sub(
+            lambda match: match.group(1) or " ", query
+        ).strip()
+
+    def get_key(self, query, **kwargs):
+        """
+        Get the key of a search
+
+        Args:
+            query (str): SPL query
+            kwargs: arguments the job is created with which affect the results,
+                Ex, earliest_time, latest_time, auto_finalize_ec
+
+        Returns:
+            str: the key of the search
+        """
+        return json.dumps(
+            [self.namespace, self.normalize_query(query), sorted(kwargs.items())],
+            default=str,
+        )
+
+    def get(self, key):
+        """
+        Get the cached entry of a search
+
+        Args:
+            key (str): key of the search, See get_key
+
+        Returns:
+            dict: the entry. None if the search is not cached.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        if self.disk_cache is not None:
+            entry = self.disk_cache.get(self._get_disk_key(key), None)
+            if entry is not None:
+                self._set_memory(key, entry)
+                return entry
+        return None
+
+    def set(self, key, entry):
+        """
+        Cache the entry of a search
+
+        Args:
+            key (str): key of the search, See get_key
+            entry (dict): has_results & results of the search
+        """
+        self._set_memory(key, entry)
+        if self.disk_cache is not None:
+            self.disk_cache.set(self._get_disk_key(key), entry)
+
+    def _set_memory(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _get_disk_key(self, key):
+        return self.DISK_KEY.format(hashlib.sha1(key.encode("utf-8")).hexdigest())
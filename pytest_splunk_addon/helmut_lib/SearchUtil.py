@@ -16,6 +16,8 @@ import difflib
 import subprocess
 import csv
 import io
+from concurrent.futures import ThreadPoolExecutor
+from ..helmut.manager.jobs.results import Results
 
 try:
     import py
@@ -35,12 +37,228 @@ class SearchUtilException(Exception):
 
 
 class SearchUtil(object):
-    def __init__(self, jobs, logger):
+    SEARCH_CONCURRENCY_QUERY = (
+        "| rest /services/server/status/limits/search-concurrency"
+        " splunk_server=local | fields max_hist_searches"
+    )
+    INGESTION_QUERY = "| tstats count where index=* by sourcetype"
+    # The count checks are short searches, the job is created once it is done
+    # so that Job.wait returns on its first status check
+    SHORT_SEARCH_EXEC_MODE = "blocking"
+    INGESTION_WINDOW_QUERY = (
+        "search (index=* OR index=_internal) _index_earliest={since}"
+        " | stats min(_time) as earliest_time, min(_indextime) as index_earliest"
+    )
+
+    def __init__(self, jobs, logger, max_concurrent_searches=4):
         """
         Constructor of the SearchUtil object.
+
+        max_concurrent_searches limits the number of jobs dispatched with
+        submit() which can run at the same time.
+
+        If result_cache (SearchResultCache) is set, the outcome of the count
+        checks & getFieldValuesList is cached and an identical search is not
+        dispatched again.
         """
         self.logger = logger
         self.jobs = jobs
+        self.max_concurrent_searches = max_concurrent_searches
+        self.is_data_indexed = False
+        self.result_cache = None
+        self._executor = None
+
+    @property
+    def executor(self):
+        """
+        Thread pool which runs the jobs dispatched with submit().
+        Created on the first submit.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrent_searches
+            )
+        return self._executor
+
+    def submit(self, query, max_time=120, **kwargs):
+        """
+        Dispatch a search without waiting for it to finish. At most
+        max_concurrent_searches jobs are in flight, the rest are queued.
+
+        Args:
+            query (str): query to search on Splunk instance
+            max_time (int): maximum time the job can run
+            kwargs: arguments to create the job with
+
+        Returns:
+            concurrent.futures.Future: resolves to the Results of the job
+        """
+        self.logger.debug("submitting query %s", query)
+        return self.executor.submit(self._run_search, query, max_time, **kwargs)
+
+    def gather(self, futures, timeout=None):
+        """
+        Wait for the searches dispatched with submit()
+
+        Args:
+            futures (list): futures returned by submit()
+            timeout (int): maximum time to wait for each search
+
+        Returns:
+            list: Results of each search, in the order of futures
+
+        Raises:
+            SearchUtilException: if a search job failed
+        """
+        return [each_future.result(timeout) for each_future in futures]
+
+    def shutdown(self):
+        """
+        Wait for the searches in flight and stop the thread pool
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _run_search(self, query, max_time, **kwargs):
+        job = self.jobs.create(query, max_time=max_time, **kwargs)
+        job.wait(max_time)
+        if job.is_failed():
+            raise SearchUtilException(
+                "The search job {} failed: {}".format(job.sid, job.get_messages())
+            )
+        # All the pages of the results, get_results() reads only the first one
+        return Results(list(job.iter_results()))
+
+    def get_search_concurrency_limit(self):
+        """
+        Get the number of historical searches the search head can run
+        at the same time.
+
+        Returns:
+            int: the concurrency limit. None if it could not be found.
+        """
+        try:
+            results = self._run_search(self.SEARCH_CONCURRENCY_QUERY, 60)
+            if len(results) > 0:
+                return int(str(results[0]["max_hist_searches"]))
+        except Exception as e:
+            self.logger.warning("Could not get the search concurrency limit: %s", e)
+        return None
+
+    def wait_for_ingestion(self, timeout=300, interval=10):
+        """
+        Wait until the data is indexed. The event count of each sourcetype
+        is checked with tstats at every interval, the data is considered
+        indexed once two consecutive counts are the same and not empty.
+        The internal indexes are not included in the counts.
+
+        Once the data is indexed, the searches are executed only once and
+        the retries are skipped.
+
+        Args:
+            timeout (int): maximum time to wait for the data
+            interval (int): time between two checks of the event counts
+
+        Returns:
+            bool: True if the event counts stabilised within the timeout
+        """
+        start_time = time.time()
+        previous_counts = None
+        max_time = max(interval, 60)
+        while time.time() < start_time + timeout:
+            job = self.jobs.create(self.INGESTION_QUERY, max_time=max_time)
+            job.wait(max_time)
+            counts = {
+                str(each_result["sourcetype"]): str(each_result["count"])
+                for each_result in job.iter_results()
+            }
+            self.logger.debug("Event count of each sourcetype: %s", counts)
+            # Nothing is indexed yet if there are no events at all
+            if counts and counts == previous_counts:
+                self.logger.info("The data is indexed. Searches will not be retried.")
+                self.is_data_indexed = True
+                return True
+            previous_counts = counts
+            time.sleep(interval)
+        self.logger.warning(
+            "The event counts did not stabilise in %d seconds. "
+            "Searches will be retried.",
+            timeout,
+        )
+        return False
+
+    def record_ingestion_window(self, since):
+        """
+        Find the start of the ingestion window of the test data, the first
+        _time and _indextime of the events indexed since the given time.
+        Every job created afterwards starts at the window, so that only the
+        buckets of the test data are searched. The end of the window is
+        left open, so the events indexed later in the session, Ex, the
+        internal errors, are still found.
+
+        Args:
+            since (int): epoch time from which the test data was indexed
+
+        Returns:
+            dict: the time bounds of the jobs. None if the window could
+                not be found, the jobs are not limited then.
+        """
+        try:
+            results = self._run_search(
+                self.INGESTION_WINDOW_QUERY.format(since=int(since)), 300
+            )
+            window = results[0] if len(results) > 0 else {}
+            time_bounds = {
+                "earliest_time": int(float(str(window["earliest_time"]))),
+                "index_earliest": int(float(str(window["index_earliest"]))),
+            }
+        except Exception as e:
+            self.logger.warning("Could not find the ingestion window: %s", e)
+            return None
+        self.logger.info("Limiting the searches to the ingestion window %s", time_bounds)
+        self.jobs.time_bounds = time_bounds
+        return time_bounds
+
+    def _get_cached_entry(self, query, **kwargs):
+        """
+        Get the cached outcome of a search
+
+        Returns:
+            tuple: (key, entry). key is None if there is no result cache,
+                entry is None if the search is not cached.
+        """
+        if self.result_cache is None:
+            return None, None
+        # The outcome depends on the time bounds the job is created with
+        kwargs = dict(getattr(self.jobs, "time_bounds", {}), **kwargs)
+        key = self.result_cache.get_key(query, **kwargs)
+        entry = self.result_cache.get(key)
+        if entry is not None:
+            self.logger.debug("Found the outcome of the query in the cache")
+        return key, entry
+
+    def _cache_entry(self, key, has_results, results=None):
+        """
+        Cache the outcome of a search. A search without results is cached
+        only once the data is indexed, as it may find results in a retry.
+        """
+        if key is None or not (has_results or self.is_data_indexed):
+            return
+        self.result_cache.set(key, {"has_results": has_results, "results": results})
+
+    def _get_retries(self, retries):
+        """
+        No retries are needed once the data is indexed
+        """
+        return 0 if self.is_data_indexed else retries
+
+    def _wait_before_retry(self, tryNum, retries, interval):
+        """
+        Sleep before the next try. Skipped after the last try.
+        """
+        if tryNum <= retries:
+            time.sleep(interval)
 
     def failTest(self, message):
         """
@@ -62,6 +280,7 @@ class SearchUtil(object):
         max_time=60,
     ):
         tryNum = 0
+        retries = self._get_retries(retries)
         r = re.compile(regex)
         while tryNum <= retries:
             job = self.jobs.create(
@@ -69,7 +288,7 @@ class SearchUtil(object):
             )
             job.wait()
             results = job.get_results()
-            for result_no, result in enumerate(results.as_list):
+            for result_no, result in enumerate(results.iter_event_views()):
                 if result_no > number_results:
                     self.logger.debug(
                         "could not find re: %s in first %d results",
@@ -86,15 +305,18 @@ class SearchUtil(object):
                     )
                     return True
             tryNum += 1
-            time.sleep(interval)
+            self._wait_before_retry(tryNum, retries, interval)
         self.logger.debug("could not find re: %s", regex)
         return False
 
     def checkQueryCount(self, query, targetCount, interval=15, retries=4, max_time=120):
         self.logger.debug("query is %s", query)
         tryNum = 0
+        retries = self._get_retries(retries)
         while tryNum <= retries:
-            job = self.jobs.create(query, max_time=max_time)
+            job = self.jobs.create(
+                query, max_time=max_time, exec_mode=self.SHORT_SEARCH_EXEC_MODE
+            )
             job.wait(max_time)
             result_count = job.get_result_count()
             if result_count == targetCount:
@@ -106,7 +328,7 @@ class SearchUtil(object):
                     targetCount,
                 )
                 tryNum += 1
-                time.sleep(interval)
+                self._wait_before_retry(tryNum, retries, interval)
 
         return False
 
@@ -114,34 +336,56 @@ class SearchUtil(object):
         self, query, interval=15, retries=4, max_time=120
     ):
         self.logger.debug("query is %s", query)
+        key, entry = self._get_cached_entry(query, auto_finalize_ec=200)
+        if entry is not None:
+            return entry["has_results"]
         tryNum = 0
+        retries = self._get_retries(retries)
         while tryNum <= retries:
-            job = self.jobs.create(query, auto_finalize_ec=200, max_time=max_time)
+            job = self.jobs.create(
+                query,
+                auto_finalize_ec=200,
+                max_time=max_time,
+                exec_mode=self.SHORT_SEARCH_EXEC_MODE,
+            )
             job.wait(max_time)
-            result_count = len(job.get_results())
-            if result_count > 0:
-                self.logger.debug("Count of results is > 0, it is:%d", result_count)
+            if job.has_any_result():
+                self.logger.debug("Count of results is > 0")
+                self._cache_entry(key, True)
                 return True
             else:
                 self.logger.debug("Count of results is 0")
                 tryNum += 1
-                time.sleep(interval)
+                self._wait_before_retry(tryNum, retries, interval)
+        self._cache_entry(key, False, [])
         return False
 
     def checkQueryCountIsZero(self, query, max_time=120):
         self.logger.debug("query is %s", query)
         tryNum = 0
-
-        job = self.jobs.create(query, auto_finalize_ec=200, max_time=max_time)
+        key, entry = self._get_cached_entry(query, auto_finalize_ec=200)
+        if entry is not None and not entry["has_results"]:
+            return True, None
+        if entry is not None and entry["results"] is not None:
+            return False, Results(entry["results"])
+
+        job = self.jobs.create(
+            query,
+            auto_finalize_ec=200,
+            max_time=max_time,
+            exec_mode=self.SHORT_SEARCH_EXEC_MODE,
+        )
         job.wait(max_time)
-        result_count = len(job.get_results())
 
-        if result_count == 0:
+        if not job.has_any_result():
             self.logger.debug("Count of results is 0")
+            self._cache_entry(key, False, [])
             return True, None
         else:
-            self.logger.debug("Count of results is > 0, it is:%d", result_count)
-            return False, job.get_results()
+            results = job.get_results()
+            self.logger.debug("Count of results is > 0, it is:%d", len(results))
+            self._cache_entry(key, True, results.to_list())
+            return False, results
 
     def checkQueryFields(
         self,
@@ -159,6 +403,7 @@ class SearchUtil(object):
         """
 
         tryNum = 0
+        retries = self._get_retries(retries)
         status = False
 
         if not isinstance(expected, set):
@@ -171,7 +416,7 @@ class SearchUtil(object):
             results = job.get_results()
             messages = job.get_messages()
 
-            if len(job.get_results()) > 0:
+            if len(results) > 0:
                 fields = list(results[0].keys())
                 if expected.issubset(fields):
                     self.wrapLogOutput(
@@ -198,7 +443,7 @@ class SearchUtil(object):
 
             if not status:
                 tryNum += 1
-                time.sleep(interval)
+                self._wait_before_retry(tryNum, retries, interval)
 
         return status
 
@@ -348,6 +593,7 @@ class SearchUtil(object):
         """
 
         tryNum = 0
+        retries = self._get_retries(retries)
         status = False
 
         path_to_output = os.path.join(os.getcwd(), "data")
@@ -379,7 +625,7 @@ class SearchUtil(object):
                     actual = [
                         "%s\n" % [str(field) for field in row]
                         for row in [list(results[0].keys())]
-                        + [list(row.values()) for row in results]
+                        + [list(row.values()) for row in results.iter_event_views()]
                     ]
                     expected = [
                         "%s\n" % [str(field) for field in row]
@@ -387,7 +633,7 @@ class SearchUtil(object):
                     ]
                 else:
                     actual = [",".join(list(results[0].keys())) + "\n"]
-                    for result in results:
+                    for result in results.iter_event_views():
                         actual.append(",".join(map(str, list(result.values()))) + "\n")
                     expected = output.readlines(True)
                 status = self.compareContent(actual, expected)
@@ -401,7 +647,7 @@ class SearchUtil(object):
 
             if not status:
                 tryNum += 1
-                time.sleep(interval)
+                self._wait_before_retry(tryNum, retries, interval)
 
         output.close()
         return status
@@ -463,10 +709,10 @@ class SearchUtil(object):
                 str(warningGapSizeLimit),
             )
 
-            if len(job.get_results()) > 0:
+            if len(results) > 0:
                 warningCount = 0
                 errorCount = 0
-                for result in results:
+                for result in results.iter_event_views():
                     if float(str(result["delta"])) <= warningGapSizeLimit:
                         # This is a warning sized gap. just report the warning and increase the warningCount
                         warningCount += 1
@@ -563,6 +809,7 @@ class SearchUtil(object):
             """
         status = False
         tryNum = 0
+        retries = self._get_retries(retries)
 
         self.logger.debug('Running canon test with canon="%s"', str(canon))
 
@@ -573,11 +820,9 @@ class SearchUtil(object):
 
             self.logger.debug('Ran canon test search="%s"', query)
 
-            if len(job.get_results()) > 0:
-                # Build Result Set
-                actual = set()
-                for result in results:
-                    actual.add(str(result[field]))
+            if len(results) > 0:
+                # Build Result Set from the column of the field
+                actual = set(map(str, results.get_values(field)))
 
                 if canon == actual:
                     self.wrapLogOutput(
@@ -611,7 +856,7 @@ class SearchUtil(object):
 
             if not status:
                 tryNum += 1
-                time.sleep(interval)
+                self._wait_before_retry(tryNum, retries, interval)
 
         return status
 
@@ -673,17 +918,18 @@ class SearchUtil(object):
         """
 
         tryNum = 0
+        retries = self._get_retries(retries)
         status = False
 
         while tryNum <= retries and not status:
 
             job = self.jobs.create(query, auto_finalize_ec=10, max_time=60)
             job.wait(TIMEOUT)
-            result_count = len(job.get_results())
             results = job.get_results()
+            result_count = len(results)
             messages = job.get_messages()
 
-            if len(job.get_results()) > 0:
+            if len(results) > 0:
                 # we need to cast to str before int because it's a ResultField
                 # which can't be cast directly to str...
                 values = str(list(results[expectedMinRow - 1].values()))
@@ -714,7 +960,7 @@ class SearchUtil(object):
 
             if not status:
                 tryNum += 1
-                time.sleep(interval)
+                self._wait_before_retry(tryNum, retries, interval)
 
         return status
 
@@ -735,6 +981,7 @@ class SearchUtil(object):
         """
 
         tryNum = 0
+        retries = self._get_retries(retries)
         status = False
 
         while tryNum <= retries and not status:
@@ -782,7 +1029,7 @@ class SearchUtil(object):
 
             if not status:
                 tryNum += 1
-                time.sleep(interval)
+                self._wait_before_retry(tryNum, retries, interval)
 
         return status
 
@@ -830,6 +1077,7 @@ class SearchUtil(object):
         self.logger.debug("Retry count: %d", retries)
 
         tryNum = 0
+        retries = self._get_retries(retries)
         searchQuery = "search `notable(" + searchName + ")`"
         searchResults = []
         while tryNum <= retries:
@@ -844,7 +1092,7 @@ class SearchUtil(object):
             else:
                 self.logger.debug("Retries: %d", tryNum)
                 tryNum += 1
-                time.sleep(interval)
+                self._wait_before_retry(tryNum, retries, interval)
         return searchResults
 
     def gen_table(self, table):
@@ -901,6 +1149,7 @@ class SearchUtil(object):
         """
 
         tryNum = 0
+        retries = self._get_retries(retries)
         status = False
 
         while tryNum <= retries and not status:
@@ -944,7 +1193,7 @@ class SearchUtil(object):
 
             if not status:
                 tryNum += 1
-                time.sleep(interval)
+                self._wait_before_retry(tryNum, retries, interval)
 
         return status
 
@@ -956,14 +1205,15 @@ class SearchUtil(object):
         """
 
         tryNum = 0
+        retries = self._get_retries(retries)
         status = False
 
         while tryNum <= retries and not status:
 
             job = self.jobs.create(query, max_time=60)
             job.wait(240)
-            result_count = len(job.get_results())
             results = job.get_results()
+            result_count = len(results)
             messages = job.get_messages()
 
             if result_count > 0:
@@ -986,7 +1236,7 @@ class SearchUtil(object):
 
             if not status:
                 tryNum += 1
-                time.sleep(interval)
+                self._wait_before_retry(tryNum, retries, interval)
 
         return status
 
@@ -1002,22 +1252,33 @@ class SearchUtil(object):
             retries (int): number of retries to make if no results found
         """
 
+        key, entry = self._get_cached_entry(query)
+        if entry is not None and (entry["results"] is not None or not entry["has_results"]):
+            for each_result in entry["results"] or []:
+                yield dict(each_result)
+            return False
+
         tryNum = 0
+        retries = self._get_retries(retries)
         status = False
 
         while tryNum <= retries and not status:
             job = self.jobs.create(query, max_time=60)
             job.wait(240)
-            result_count = len(job.get_results())
-            results = job.get_results()
             messages = job.get_messages()
 
-            if result_count > 0:
-                for each_result in results:
+            if job.has_any_result():
+                # The results are kept only if they are cached
+                results = [] if key is not None else None
+                for each_result in job.iter_results():
                     keys = list(map(str, list(each_result.keys())))
                     values = list(map(str, list(each_result.values())))
-                    yield dict(list(zip(keys, values)))
-                break
+                    result = dict(list(zip(keys, values)))
+                    if results is not None:
+                        results.append(result)
+                    yield result
+                self._cache_entry(key, True, results)
+                return status
             else:
                 self.wrapLogOutput(
                     msg="Zero results from search:",
@@ -1028,8 +1289,9 @@ class SearchUtil(object):
 
             if not status:
                 tryNum += 1
-                time.sleep(interval)
+                self._wait_before_retry(tryNum, retries, interval)
 
+        self._cache_entry(key, False, [])
         return status
 
     def checkRemoteSearch(self, query, starts_with=None, max_time=120):
@@ -1068,6 +1330,7 @@ class SearchUtil(object):
         max_time=60,
     ):
         tryNum = 0
+        retries = self._get_retries(retries)
         r = re.compile(regex)
         match_found = False
         while tryNum <= retries:
@@ -1077,7 +1340,7 @@ class SearchUtil(object):
             job.wait()
             results = job.get_results()
 
-            for result_no, result in enumerate(results.as_list):
+            for result_no, result in enumerate(results.iter_event_views()):
                 if r.match(str(result[field])):
                     self.logger.debug(
                         "result['%s']='%s' matches re: %s",
@@ -1102,7 +1365,7 @@ class SearchUtil(object):
                     )
                     return match_found
             tryNum += 1
-            time.sleep(interval)
+            self._wait_before_retry(tryNum, retries, interval)
         return match_found
 
     def checkQueryAllFieldAllValuesContainsRegex(
@@ -1115,6 +1378,7 @@ class SearchUtil(object):
         max_time=60,
     ):
         tryNum = 0
+        retries = self._get_retries(retries)
         match_found = False
         field_names = list(field_regex_json.keys())
         while tryNum <= retries:
@@ -1124,7 +1388,7 @@ class SearchUtil(object):
             job.wait()
             results = job.get_results()
 
-            for result_no, result in enumerate(results.as_list):
+            for result_no, result in enumerate(results.iter_event_views()):
                 for field in field_names:
                     regex = field_regex_json[field]
                     r = re.compile(regex)
@@ -1162,5 +1426,5 @@ class SearchUtil(object):
                         )
                         return False
             tryNum += 1
-            time.sleep(interval)
+            self._wait_before_retry(tryNum, retries, interval)
         return match_found
@@ -5,8 +5,11 @@ import traceback
 from .standard_lib import AppTestGenerator
 
 LOG_FILE = "pytest_splunk_addon.log"
+# Key of the workerinput through which pytest-xdist workers get the test cases
+MANIFEST_KEY = "splunk_test_manifest"
 
 test_generator = None
+test_manifest = None
 def pytest_configure(config):
     global test_generator
     """
@@ -53,6 +56,44 @@ def pytest_configure(config):
     )
     if config.getoption("splunk_app", None):
         test_generator = AppTestGenerator(config)
+        # pytest-xdist worker: the test cases are generated by the controller
+        manifest = getattr(config, "workerinput", {}).get(MANIFEST_KEY)
+        if manifest:
+            test_generator.load_manifest(manifest)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """
+    pytest-xdist hook on the controller, called for each worker.
+    The test cases are generated once in the controller and sent to the
+    workers so that each worker does not parse the add-on again.
+    """
+    global test_manifest
+    if test_generator is None:
+        return
+    if test_manifest is None:
+        LOGGER.info("Generating the test manifest for the pytest-xdist workers")
+        try:
+            test_manifest = test_generator.get_manifest()
+        except Exception:
+            # The workers generate the test cases & report the error themselves
+            LOGGER.exception("Could not generate the test manifest")
+            test_manifest = b""
+    if test_manifest:
+        node.workerinput[MANIFEST_KEY] = test_manifest
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    """
+    pytest-xdist hook to create the scheduler of the tests.
+    With --dist=loadscope, the tests are grouped by their stanza.
+    """
+    if config.getoption("dist") == "loadscope":
+        from .xdist_scheduler import StanzaScheduling
+
+        return StanzaScheduling(config, log)
 
 
 def pytest_generate_tests(metafunc):
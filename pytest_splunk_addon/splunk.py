@@ -1,14 +1,15 @@
 # -*- coding: utf-8 -*-
 """
 Module usage:
-- splunk_appinspect: To parse the configuration files from Add-on package
+- standard_lib.addon_parser: To parse the configuration files from Add-on package
 - helmut : To connect to a Splunk instance. source: splunk-sdk
 - helmut_lib: Provides various Utility functions to search on Splunk. Source: splunk-sdk
 """
 
 import logging
 import os
-from time import sleep
+import argparse
+from time import sleep, time
 import json
 import pytest
 import requests
@@ -16,6 +17,13 @@ import splunklib.client as client
 from .helmut.manager.jobs import Jobs
 from .helmut.splunk.cloud import CloudSplunk
 from .helmut_lib.SearchUtil import SearchUtil
+from .helmut_lib.SearchResultCache import SearchResultCache
+from .standard_lib.fields_tests import FieldBatchSearch
+from .standard_lib.cim_tests import DataSetBatchSearch, DataModelHandler
+from .standard_lib.app_test_generator import DATA_MODEL_PATH
+from .standard_lib.coverage_table import CoverageTable
+from .standard_lib.index_scope import IndexScope
+from .standard_lib.addon_parser import AddonModelCache
 
 RESPONSIVE_SPLUNK_TIMEOUT = 300  # seconds
 
@@ -136,6 +144,92 @@ def pytest_addoption(parser):
             " 2) 8.0.0: GA release of 8.0.0."
         ),
     )
+    group.addoption(
+        "--splunk-search-concurrency",
+        action="store",
+        type=positive_int,
+        dest="splunk_search_concurrency",
+        default="4",
+        help=(
+            "Maximum number of searches a test session can run at the same time."
+            " It is further limited by the search concurrency quota of the"
+            " Splunk instance, divided among the pytest-xdist workers. default is 4."
+        ),
+    )
+    group.addoption(
+        "--splunk-ingestion-timeout",
+        action="store",
+        dest="splunk_ingestion_timeout",
+        default="0",
+        help=(
+            "Time in seconds to wait for the event count of each sourcetype to"
+            " stabilise before executing the searches. Once the data is indexed,"
+            " the searches are not retried. default is 0, which disables the wait."
+        ),
+    )
+    group.addoption(
+        "--splunk-ingestion-window",
+        action="store",
+        dest="splunk_ingestion_window",
+        default="0",
+        help=(
+            "Time in seconds before the start of the session from which the"
+            " test data may have been indexed. The searches start at the"
+            " earliest event indexed since then, found once the ingestion wait"
+            " is over, so it requires --splunk-ingestion-timeout. Use it on"
+            " Splunk instances which hold older data. default is 0, which"
+            " searches all time."
+        ),
+    )
+    group.addoption(
+        "--splunk-search-cache-size",
+        action="store",
+        dest="splunk_search_cache_size",
+        default="1000",
+        help=(
+            "Number of search outcomes cached in memory for the session. An"
+            " identical search is not dispatched again while it is cached."
+            " default is 1000, 0 disables the cache."
+        ),
+    )
+    group.addoption(
+        "--splunk-persist-search-cache",
+        action="store_true",
+        dest="splunk_persist_search_cache",
+        default=False,
+        help=(
+            "Persist the cached search outcomes in the pytest cache, so that"
+            " the next sessions (Ex, reruns with --lf) do not dispatch the"
+            " searches again. Use only if the add-on and the indexed data do"
+            " not change between the sessions. Cleared with --cache-clear."
+        ),
+    )
+    group.addoption(
+        "--splunk-coverage-table",
+        action="store",
+        dest="splunk_coverage_table",
+        help=(
+            "Path of a SQLite file for the coverage table of the indexed events."
+            " The event counts of the field, tag and eventtype tests are computed"
+            " with one search per stanza before the tests and the tests are"
+            " answered from the table. The table is reused by the next sessions"
+            " of the same Splunk instance and add-on build, remove the file if"
+            " the indexed data changes."
+        ),
+    )
+    group.addoption(
+        "--splunk-index-scope",
+        action="store_true",
+        dest="splunk_index_scope",
+        default=False,
+        help=(
+            "Limit the searches of the sourcetype stanzas to the indexes which"
+            " hold the events of the sourcetype, instead of index=*. The indexes"
+            " are found with a single search once the ingestion wait is over,"
+            " so it requires --splunk-ingestion-timeout and is ignored if the"
+            " wait does not succeed."
+        ),
+    )
     group.addoption(
         "--splunk-dm-path",
         action="store",
@@ -150,8 +244,24 @@ def pytest_addoption(parser):
     )
 
 
+def positive_int(value):
+    """
+    Type of the options which accept an integer of at least 1
+
+    Args:
+        value (str): value of the option
+
+    Returns:
+        int: the value as an integer
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+    return number
+
+
 @pytest.fixture(scope="session")
-def splunk_search_util(splunk):
+def splunk_search_util(request, splunk):
     """
     This is a simple connection to Splunk via the SplunkSDK
 
@@ -159,6 +269,7 @@ def splunk_search_util(splunk):
         helmut_lib.SearchUtil.SearchUtil: The SearchUtil object
     """
     LOGGER.info("Initializing SearchUtil for the Splunk instace.")
+    session_start = time()
     cloud_splunk = CloudSplunk(
         splunkd_host=splunk["host"],
         splunkd_port=splunk["port"],
@@ -166,11 +277,209 @@ def splunk_search_util(splunk):
         password=splunk["password"],
     )
 
-    conn = cloud_splunk.create_logged_in_connector()
+    # A keep-alive connection for each search that can run at the same time
+    conn = cloud_splunk.create_logged_in_connector(
+        pool_size=request.config.getoption("splunk_search_concurrency")
+    )
     jobs = Jobs(conn)
+    search_util = SearchUtil(jobs, LOGGER)
+    search_util.max_concurrent_searches = get_search_concurrency(request, search_util)
+    search_util.result_cache = get_search_result_cache(request, splunk)
+    ingestion_timeout = int(request.config.getoption("splunk_ingestion_timeout"))
+    is_data_indexed = False
+    if ingestion_timeout:
+        LOGGER.info("Waiting for the data to be indexed.")
+        is_data_indexed = search_util.wait_for_ingestion(timeout=ingestion_timeout)
+    ingestion_window = int(request.config.getoption("splunk_ingestion_window"))
+    if ingestion_window and is_data_indexed:
+        search_util.record_ingestion_window(since=session_start - ingestion_window)
+    elif ingestion_window:
+        # The window of data which is still being indexed would be incomplete
+        LOGGER.warning(
+            "--splunk-ingestion-window is ignored as the ingestion wait did not"
+            " succeed. Provide --splunk-ingestion-timeout for the data to settle."
+        )
     LOGGER.info("initialized SearchUtil for the Splunk instace.")
 
-    return SearchUtil(jobs, LOGGER)
+    yield search_util
+    search_util.shutdown()
+
+
+def get_search_concurrency(request, search_util):
+    """
+    Get the number of searches the test session can run at the same time.
+    The search concurrency quota of the Splunk instance is shared between
+    the pytest-xdist workers.
+
+    Args:
+        request (SubRequest): pytest request of the fixture
+        search_util (SearchUtil): the util class to search on the Splunk instance
+
+    Returns:
+        int: maximum number of concurrent searches
+    """
+    search_concurrency = request.config.getoption("splunk_search_concurrency")
+    quota = search_util.get_search_concurrency_limit()
+    if quota:
+        worker_count = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", 1))
+        search_concurrency = min(search_concurrency, max(1, quota // worker_count))
+    LOGGER.info("Search concurrency for the session: %d", search_concurrency)
+    return search_concurrency
+
+
+def get_search_result_cache(request, splunk):
+    """
+    Get the cache of the search outcomes of the session
+
+    Args:
+        request (SubRequest): pytest request of the fixture
+        splunk (dict): Details of the splunk instance
+
+    Returns:
+        SearchResultCache: the cache. None if the cache is disabled.
+    """
+    cache_size = int(request.config.getoption("splunk_search_cache_size"))
+    if not cache_size:
+        return None
+    disk_cache = None
+    if request.config.getoption("splunk_persist_search_cache"):
+        disk_cache = getattr(request.config, "cache", None)
+    return SearchResultCache(
+        max_size=cache_size,
+        disk_cache=disk_cache,
+        namespace="{}:{}".format(splunk["host"], splunk["port"]),
+    )
+
+
+@pytest.fixture(scope="session")
+def splunk_index_scope(request, splunk_search_util):
+    """
+    The indexes of the sourcetypes, found once for the session
+    if --splunk-index-scope is provided and the ingestion wait succeeded.
+
+    Returns:
+        standard_lib.index_scope.IndexScope: The IndexScope object.
+            Not limited to any index if the option is not provided.
+    """
+    if not request.config.getoption("splunk_index_scope"):
+        return IndexScope()
+    if not splunk_search_util.is_data_indexed:
+        # The indexes of the data which is still being indexed may be missing
+        LOGGER.warning(
+            "--splunk-index-scope is ignored as the ingestion wait did not"
+            " succeed. Provide --splunk-ingestion-timeout for the data to settle."
+        )
+        return IndexScope()
+    return IndexScope.discover(splunk_search_util)
+
+
+def get_session_params(session, fixture):
+    """
+    Get the params of a parametrized fixture from the tests of the session
+
+    Args:
+        session (pytest.Session): the test session
+        fixture (str): name of the fixture
+
+    Returns:
+        list: the params of the fixture, in the order of the tests
+    """
+    test_params = []
+    for each_item in session.items:
+        callspec = getattr(each_item, "callspec", None)
+        if callspec and fixture in callspec.params:
+            test_params.append(callspec.params[fixture])
+    return test_params
+
+
+@pytest.fixture(scope="session")
+def splunk_field_batch(request, splunk_search_util, splunk_index_scope):
+    """
+    Batches the positive field tests of the session stanza-wise.
+    A single search is executed for all the tests of a stanza.
+
+    Returns:
+        standard_lib.fields_tests.FieldBatchSearch: The FieldBatchSearch object
+    """
+    test_params = get_session_params(
+        request.session, "splunk_searchtime_fields_positive"
+    )
+    LOGGER.info("Batching %d positive field tests.", len(test_params))
+
+    return FieldBatchSearch(
+        splunk_search_util, test_params, index_scope=splunk_index_scope
+    )
+
+
+@pytest.fixture(scope="session")
+def splunk_cim_batch(request, splunk_search_util):
+    """
+    Batches the CIM field tests of the session data set-wise.
+    A single search is executed for all the fields of a data set.
+
+    Returns:
+        standard_lib.cim_tests.DataSetBatchSearch: The DataSetBatchSearch object
+    """
+    test_params = get_session_params(request.session, "splunk_searchtime_cim_fields")
+    LOGGER.info("Batching %d CIM field tests.", len(test_params))
+
+    return DataSetBatchSearch(splunk_search_util, test_params)
+
+
+@pytest.fixture(scope="session")
+def splunk_coverage_table(request, splunk, splunk_search_util, splunk_index_scope):
+    """
+    The coverage table of the indexed events, if --splunk-coverage-table is provided.
+    The searches of the stanzas are executed before the tests. With
+    pytest-xdist, a stanza is searched by the worker of its first test.
+    The rows of the table are kept per Splunk instance and add-on fingerprint.
+
+    Returns:
+        standard_lib.coverage_table.CoverageTable: The CoverageTable object.
+            None if the coverage table is not enabled.
+    """
+    db_path = request.config.getoption("splunk_coverage_table")
+    if not db_path:
+        yield None
+        return
+    addon_hash = AddonModelCache(
+        None, request.config.getoption("splunk_app")
+    ).get_addon_hash()
+    coverage_table = CoverageTable(
+        db_path,
+        splunk_search_util,
+        index_scope=splunk_index_scope,
+        namespace="{}:{}/{}".format(splunk["host"], splunk["port"], addon_hash),
+    )
+    add_test = {
+        "splunk_searchtime_fields_positive": coverage_table.add_field_test,
+        "splunk_searchtime_fields_tags": coverage_table.add_tag_test,
+        "splunk_searchtime_fields_eventtypes": coverage_table.add_eventtype_test,
+    }
+    for fixture, each_add_test in add_test.items():
+        for each_param in get_session_params(request.session, fixture):
+            each_add_test(each_param)
+    if not os.environ.get("PYTEST_XDIST_WORKER"):
+        coverage_table.warm_up()
+
+    yield coverage_table
+    coverage_table.close()
+
+
+@pytest.fixture(scope="session")
+def splunk_data_model_handler(request):
+    """
+    The data models the CIM tests of the session are generated from.
+    The data models of --splunk-dm-path or the data models of the plugin.
+
+    Returns:
+        standard_lib.cim_tests.DataModelHandler: The DataModelHandler object
+    """
+    data_model_path = request.config.getoption("splunk_dm_path") or DATA_MODEL_PATH
+    LOGGER.info("Loading the data models from %s", data_model_path)
+    return DataModelHandler(
+        data_model_path, cache=getattr(request.config, "cache", None)
+    )
 
 
 @pytest.fixture(scope="session")
@@ -6,18 +6,22 @@ parse the knowledge objects from an Add-on's configuration files
 Supports: fields from props & transforms, tags, eventtypes
 
 Dependencies: 
-    splunk_appinspect.App: To parse the configuration files 
+    ConfParser: To parse the configuration files 
+    splunk_appinspect.App (optional): To parse the files ConfParser can not decode,
+        decoded as latin-1 if it is not installed
+    pytest cache (optional): To persist the parsed knowledge objects
 """
 import os
 import re
 import logging
-from splunk_appinspect import App
 
+from .conf_parser import ConfParser
 from .fields import convert_to_fields, Field
 from .transforms_parser import TransformsParser
 from .props_parser import PropsParser
 from .tags_parser import TagsParser
 from .eventtype_parser import EventTypeParser
+from .model_cache import AddonModelCache
 
 LOGGER = logging.getLogger("pytest-splunk-addon")
 
@@ -27,21 +31,29 @@ class AddonParser(object):
     Parse the knowledge objects from an Add-on's configuration files.
     Supports: fields from props & transforms, tags, eventtypes
 
+    If the pytest cache is provided, the knowledge objects are parsed once
+    and loaded from the cache until the configuration files change.
+
     Args:
         splunk_app_path (str): Path to the Splunk App
+        cache (_pytest.cacheprovider.Cache): The pytest cache (optional)
     """
-    def __init__(self, splunk_app_path):
+    def __init__(self, splunk_app_path, cache=None):
         self.splunk_app_path = splunk_app_path
-        LOGGER.info(f"Initializing the splunk_appinspect.App from path={splunk_app_path}")
+        LOGGER.info(f"Initializing the AddonParser from path={splunk_app_path}")
         self._app = None
         self._props_parser = None
         self._tags_parser = None
         self._eventtype_parser = None
+        self._model = None
+        self.model_cache = (
+            AddonModelCache(cache, splunk_app_path) if cache is not None else None
+        )
 
     @property
     def app(self):
         if not self._app:
-            self._app = App(self.splunk_app_path, python_analyzer_enable=False)
+            self._app = ConfParser(self.splunk_app_path)
         return self._app
 
     @property
@@ -62,6 +74,40 @@ class AddonParser(object):
             self._eventtype_parser = EventTypeParser(self.splunk_app_path, self.app)
         return self._eventtype_parser
 
+    @property
+    def model(self):
+        """
+        The knowledge objects of the App, loaded from the cache or parsed
+        and saved to the cache if the cache is not valid.
+        """
+        if self._model is None:
+            self._model = self.model_cache.load()
+            if self._model is None:
+                self._model = self.parse_model()
+                self.model_cache.save(self._model)
+        return self._model
+
+    def parse_model(self):
+        """
+        Parse all the knowledge objects of the App into a JSON serializable
+        dictionary
+
+        Returns:
+            dict: props_fields, tags & eventtypes of the App
+        """
+        props_fields = []
+        for each_group in self.props_parser.get_props_fields():
+            each_group = dict(each_group)
+            each_group["fields"] = [
+                each_field.to_dict() for each_field in each_group["fields"]
+            ]
+            props_fields.append(each_group)
+        return {
+            "props_fields": props_fields,
+            "tags": list(self.tags_parser.get_tags()),
+            "eventtypes": list(self.eventtype_parser.get_eventtypes()),
+        }
+
     def get_props_fields(self):
         """
         Parse the props.conf and yield all supported fields
@@ -69,7 +115,17 @@ class AddonParser(object):
         Yields:
             generator of all the supported fields 
         """
-        return self.props_parser.get_props_fields()
+        if not self.model_cache:
+            return self.props_parser.get_props_fields()
+        return (
+            dict(
+                each_group,
+                fields=[
+                    Field.get_field(each_field) for each_field in each_group["fields"]
+                ],
+            )
+            for each_group in self.model["props_fields"]
+        )
 
     def get_tags(self):
         """
@@ -78,7 +134,9 @@ class AddonParser(object):
         Yields:
             generator of stanzas from the tags
         """
-        return self.tags_parser.get_tags()
+        if not self.model_cache:
+            return self.tags_parser.get_tags()
+        return (dict(each_tag) for each_tag in self.model["tags"])
 
     def get_eventtypes(self):
         """
@@ -87,4 +145,6 @@ class AddonParser(object):
         Yields:
             generator of list of eventtypes
         """
-        return self.eventtype_parser.get_eventtypes()
+        if not self.model_cache:
+            return self.eventtype_parser.get_eventtypes()
+        return (dict(each_eventtype) for each_eventtype in self.model["eventtypes"])
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+"""
+Provides a lightweight parser for the configuration files of an App.
+The configuration files are read line by line and the settings of the
+local directory are layered over the default directory.
+
+splunk_appinspect is only imported if a configuration file can not be
+decoded as UTF-8, in which case it is used to parse that file. If it is
+not installed, the file is decoded as latin-1 instead.
+"""
+import os
+import re
+import logging
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+
+COMMENT_REGEX = re.compile(r"^\s*[#;]")
+STANZA_REGEX = re.compile(r"^\s*\[")
+SETTING_REGEX = re.compile(r"^\s*\S*\s*=")
+CONTINUATION_REGEX = re.compile(r"\\\s*$")
+
+
+class ConfSetting(object):
+    """
+    A setting of a stanza
+
+    Args:
+        name (str): key of the setting
+        value (str): value of the setting
+    """
+
+    def __init__(self, name, value):
+        self.name = name
+        self.value = value
+
+
+class ConfStanza(object):
+    """
+    A stanza of a configuration file
+
+    Args:
+        name (str): name of the stanza
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.options = {}
+
+    def add_option(self, name, value):
+        self.options[name] = ConfSetting(name, value)
+
+
+class ConfFile(object):
+    """
+    A configuration file, the stanzas are kept in the order of the file.
+    The settings of a repeated stanza are merged into the first one.
+    """
+
+    def __init__(self):
+        self.sects = {}
+
+    def add_section(self, name):
+        if name not in self.sects:
+            self.sects[name] = ConfStanza(name)
+        return self.sects[name]
+
+    def update(self, conf_file):
+        """
+        Layer the settings of another configuration file over this one
+
+        Args:
+            conf_file (ConfFile): configuration file with higher precedence
+        """
+        for stanza in conf_file.sects.values():
+            section = self.add_section(stanza.name)
+            for option in stanza.options.values():
+                section.add_option(option.name, option.value)
+
+
+class ConfParser(object):
+    """
+    Reads the configuration files of an App.
+    Provides the same methods as splunk_appinspect.App for the
+    configuration files used by the parsers.
+
+    Args:
+        splunk_app_path (str): Path of the Splunk app
+    """
+
+    LAYERS = ("default", "local")
+
+    def __init__(self, splunk_app_path):
+        self.splunk_app_path = splunk_app_path
+        self._appinspect_app = None
+
+    def props_conf(self):
+        return self.get_config("props.conf")
+
+    def transforms_conf(self):
+        return self.get_config("transforms.conf")
+
+    def eventtypes_conf(self):
+        return self.get_config("eventtypes.conf")
+
+    def get_config(self, name):
+        """
+        Parse a configuration file of the App with the local settings
+        layered over the default settings
+
+        Args:
+            name (str): name of the configuration file. Ex, props.conf
+
+        Returns:
+            ConfFile: the configuration file
+
+        Raises:
+            OSError: if the file does not exist in any of the layers
+        """
+        conf_file = None
+        for each_layer in self.LAYERS:
+            file_path = os.path.join(self.splunk_app_path, each_layer, name)
+            if not os.path.isfile(file_path):
+                continue
+            layer_conf = self._parse_layer(file_path, each_layer, name)
+            if conf_file is None:
+                conf_file = ConfFile()
+            conf_file.update(layer_conf)
+        if conf_file is None:
+            raise OSError(f"No such conf file: {name}")
+        return conf_file
+
+    def _parse_layer(self, file_path, layer, name):
+        try:
+            with open(file_path, "r", encoding="utf-8-sig") as conf_file:
+                return parse_conf(conf_file)
+        except UnicodeDecodeError:
+            LOGGER.warning("Could not decode %s as UTF-8.", file_path)
+        try:
+            appinspect_app = self.get_appinspect_app()
+        except ImportError:
+            # latin-1 decodes any byte, the non-ASCII characters may be wrong
+            LOGGER.warning(
+                "splunk_appinspect is not installed, parsing %s as latin-1.",
+                file_path,
+            )
+            with open(file_path, "r", encoding="latin-1") as conf_file:
+                return parse_conf(conf_file)
+        LOGGER.info("Parsing %s with splunk_appinspect.", file_path)
+        return appinspect_app.get_config(name, dir=layer)
+
+    def get_appinspect_app(self):
+        if not self._appinspect_app:
+            from splunk_appinspect import App
+
+            self._appinspect_app = App(
+                self.splunk_app_path, python_analyzer_enable=False
+            )
+        return self._appinspect_app
+
+
+def join_lines(lines):
+    """
+    Join the continuation lines, the lines ending with a backslash.
+    The backslash is replaced with a new line.
+
+    Args:
+        lines (iterable): lines of a configuration file
+
+    Yields:
+        logical lines of the configuration file
+    """
+    current_line = ""
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if CONTINUATION_REGEX.search(line):
+            current_line += line.rstrip()[:-1] + "\n"
+        else:
+            yield current_line + line
+            current_line = ""
+    if current_line:
+        yield current_line
+
+
+def parse_conf(lines):
+    """
+    Parse the stanzas and settings of a configuration file.
+    The settings before the first stanza belong to the default stanza.
+
+    Args:
+        lines (iterable): lines of a configuration file
+
+    Returns:
+        ConfFile: the configuration file
+    """
+    conf_file = ConfFile()
+    current_stanza = None
+    for line in join_lines(lines):
+        if not line.strip() or COMMENT_REGEX.match(line):
+            continue
+        if STANZA_REGEX.match(line):
+            start = line.index("[")
+            end = line.rfind("]", start)
+            if end == -1:
+                LOGGER.warning("Invalid stanza skipped: %s", line)
+                continue
+            current_stanza = conf_file.add_section(line[start + 1 : end])
+        elif SETTING_REGEX.match(line):
+            if current_stanza is None:
+                current_stanza = conf_file.add_section("default")
+            key, value = line.split("=", 1)
+            current_stanza.add_option(key.strip(), value.strip())
+    return conf_file
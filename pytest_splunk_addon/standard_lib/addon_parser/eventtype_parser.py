@@ -10,7 +10,7 @@ class EventTypeParser(object):
     Parses eventtypes.conf and extracts eventtypes  
     Args:
         splunk_app_path (str): Path of the Splunk app
-        app (splunk_appinspect.App): Object of Splunk app
+        app (ConfParser): Object to read the configuration files of the app
     """
     def __init__(self, splunk_app_path, app):
         self.app = app 
@@ -4,16 +4,24 @@ Provides the Field class containing all the field properties and a decorator
 to convert a list to field list
 """
 
+import sys
 from functools import wraps
+
+# Shared catalog of the fields, properties of the field mapped with the Field
+FIELD_CATALOG = {}
+
+
 class Field(object):
     """
-        Contains the field properties
+        Contains the field properties.
+        The field is immutable, the list properties are stored as tuples.
+        Use Field.get_field to get the shared instance from the catalog.
 
         Properties:
             name (str): name of the field
             type (str): Field type. Supported [required, conditional, optional]
-            expected_values (list): The field should have this expected values
-            negative_values (list): The field should not have negative values
+            expected_values (tuple): The field should have this expected values
+            negative_values (tuple): The field should not have negative values
             condition (spl): The field should only be checked if the condition satisfies
             validity (eval): eval statement to extract the valid fields only 
 
@@ -21,18 +29,63 @@ class Field(object):
             field_json (dict): dictionary containing field properties 
     """
     SUPPORTED_TYPES = ["required", "conditional", "optional"]
+    __slots__ = (
+        "name", "type", "expected_values", "negative_values", "condition", "validity"
+    )
 
     def __init__(self, field_json=None):
-        self.name = field_json.get("name")
-        self.type = field_json.get("type") or "required"
-        self.expected_values = field_json.get("expected_values", ["*"])
-        self.negative_values = field_json.get("negative_values", ["-", ""])
-        self.condition = field_json.get("condition") or ""
-        self.validity = field_json.get("validity") or self.name
+        name = field_json.get("name")
+        if isinstance(name, str):
+            name = sys.intern(name)
+        self._set("name", name)
+        self._set("type", field_json.get("type") or "required")
+        self._set(
+            "expected_values", tuple(field_json.get("expected_values", ["*"]))
+        )
+        self._set(
+            "negative_values", tuple(field_json.get("negative_values", ["-", ""]))
+        )
+        self._set("condition", field_json.get("condition") or "")
+        self._set("validity", field_json.get("validity") or self.name)
+
+    def _set(self, name, value):
+        object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Field is immutable, can not set {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Field is immutable, can not delete {name}")
+
+    def __reduce__(self):
+        # Unpickled fields are resolved from the catalog of the process
+        return (Field.get_field, (self.to_dict(),))
 
     def __str__(self):
         return str(self.name)
 
+    @property
+    def key(self):
+        """
+        Tuple of the field properties, the key of the field in the catalog
+        """
+        return tuple(getattr(self, each) for each in Field.__slots__)
+
+    @classmethod
+    def get_field(cls, field_json):
+        """
+        Get the field of the properties from the shared catalog.
+        The field is added to the catalog if it is not already there.
+
+        Args:
+            field_json (dict): dictionary containing field properties
+
+        Returns:
+            Field: the shared field
+        """
+        field = Field(field_json)
+        return FIELD_CATALOG.setdefault(field.key, field)
+
     @classmethod
     def parse_fields(cls, field_list, **kwargs):
         """
@@ -42,7 +95,21 @@ class Field(object):
             field_list (list): list of field names 
         """
         for each_fields in field_list:
-            yield Field(dict(kwargs, **each_fields))
+            yield Field.get_field(dict(kwargs, **each_fields))
+
+    def to_dict(self):
+        """
+        Get the field properties as a dictionary, Field(field.to_dict())
+        creates the same field again.
+        """
+        return {
+            "name": self.name,
+            "type": self.type,
+            "expected_values": list(self.expected_values),
+            "negative_values": list(self.negative_values),
+            "condition": self.condition,
+            "validity": self.validity,
+        }
 
     def get_properties(self):
         return (
@@ -50,8 +117,8 @@ class Field(object):
             f"\ntype={self.type}"
             f"\ncondition={self.condition}"
             f"\nvalidity={self.validity}"
-            f"\nexpected_values={self.expected_values}"
-            f"\nnegative_values={self.negative_values}"
+            f"\nexpected_values={list(self.expected_values)}"
+            f"\nnegative_values={list(self.negative_values)}"
         )
 
 
@@ -63,5 +130,5 @@ def convert_to_fields(func):
     def inner_func(*args, **kwargs):
         for each_field in func(*args, **kwargs):
             if each_field:
-                yield Field({"name": each_field})
+                yield Field.get_field({"name": each_field})
     return inner_func
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Provides the persistent cache of the parsed knowledge objects of an Add-on
+"""
+import os
+import hashlib
+import logging
+
+from ... import __version__
+from ..fingerprint_cache import FingerprintCache
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+PARSER_PATH = os.path.dirname(os.path.abspath(__file__))
+
+
+class AddonModelCache(FingerprintCache):
+    """
+    Stores the parsed knowledge objects of an Add-on in the pytest cache,
+    so that the configuration files are parsed only once across the pytest
+    processes and sessions.
+
+    The entry is validated with a fingerprint of the files in the default,
+    local and lookups directories of the Add-on, See FingerprintCache.
+    The entries made by another version of the plugin or of the parser
+    code are not loaded.
+
+    Args:
+        cache (_pytest.cacheprovider.Cache): The pytest cache (config.cache)
+        splunk_app_path (str): Path of the Splunk app
+    """
+
+    CACHE_KEY = "pytest-splunk-addon/addon_model/{}"
+    VERSION = 1
+    FINGERPRINT_DIRS = ("default", "local", "lookups")
+
+    def __init__(self, cache, splunk_app_path):
+        super(AddonModelCache, self).__init__(cache, splunk_app_path)
+        self.splunk_app_path = splunk_app_path
+        self._version = None
+
+    @property
+    def version(self):
+        """
+        Version of the entry, made of VERSION, the version of the plugin
+        and the hash of the source files of the parser.
+        """
+        if self._version is None:
+            parser_hash = hashlib.sha1()
+            for each_file in sorted(os.listdir(PARSER_PATH)):
+                if each_file.endswith(".py"):
+                    with open(os.path.join(PARSER_PATH, each_file), "rb") as file_obj:
+                        parser_hash.update(file_obj.read())
+            self._version = "{}-{}-{}".format(
+                self.VERSION, __version__, parser_hash.hexdigest()
+            )
+        return self._version
+
+    def load(self):
+        """
+        Load the parsed knowledge objects of the Add-on
+
+        Returns:
+            dict: the model of the Add-on. None if it is not cached or the
+                files of the Add-on changed since it was cached.
+        """
+        entry = self.load_entry()
+        if not entry:
+            return None
+        if not self._is_fingerprint_valid(entry["fingerprint"]):
+            LOGGER.info("The Add-on changed since it was parsed, parsing again.")
+            return None
+        LOGGER.info("Loading the parsed Add-on from the pytest cache.")
+        return entry["model"]
+
+    def save(self, model):
+        """
+        Save the parsed knowledge objects of the Add-on
+
+        Args:
+            model (dict): the model of the Add-on, must be JSON serializable
+        """
+        fingerprint = {
+            each_file: self.get_fingerprint(each_file)
+            for each_file in self.get_files()
+        }
+        self.save_entry({"fingerprint": fingerprint, "model": model})
+
+    def get_files(self):
+        """
+        Get the files the knowledge objects of the Add-on are parsed from
+
+        Returns:
+            list: paths of the files relative to the Add-on
+        """
+        files = []
+        for each_dir in self.FINGERPRINT_DIRS:
+            for root, _, file_names in os.walk(
+                os.path.join(self.splunk_app_path, each_dir)
+            ):
+                for each_file in file_names:
+                    files.append(
+                        os.path.relpath(
+                            os.path.join(root, each_file), self.splunk_app_path
+                        )
+                    )
+        return sorted(files)
+
+    def get_addon_hash(self):
+        """
+        Get the hash of the files the knowledge objects of the Add-on are
+        parsed from. It is the same in every process & session as long as
+        the content of the files does not change.
+
+        Returns:
+            str: sha1 of the paths & the content of the files
+        """
+        addon_hash = hashlib.sha1()
+        for each_file in self.get_files():
+            addon_hash.update(each_file.encode("utf-8"))
+            addon_hash.update(self.get_hash(each_file).encode("utf-8"))
+        return addon_hash.hexdigest()
+
+    def _is_fingerprint_valid(self, fingerprint):
+        if sorted(fingerprint) != self.get_files():
+            return False
+        return all(
+            self.is_unchanged(each_file, each_fingerprint)
+            for each_file, each_fingerprint in fingerprint.items()
+        )
@@ -7,16 +7,43 @@ import re
 from itertools import product
 from . import convert_to_fields, Field
 from . import TransformsParser
+from .transforms_parser import CAPTURE_GROUP_REGEX
 
 LOGGER = logging.getLogger("pytest-splunk-addon")
 
+# The regex are compiled once for all the options of all the props.conf
+REPORT_REGEX = re.compile(r"REPORT", re.IGNORECASE)
+# Prefix of the classname -> parsing method of PropsParser
+PROPS_METHOD_MAPPING = {
+    "EXTRACT": "get_extract_fields",
+    "EVAL": "get_eval_fields",
+    "FIELDALIAS": "get_fieldalias_fields",
+    "LOOKUP": "get_lookup_fields",
+}
+PROPS_METHOD_REGEX = re.compile("|".join(PROPS_METHOD_MAPPING), re.IGNORECASE)
+SOURCE_REGEX = re.compile(r"source::(.*)")
+SOURCE_GROUP_REGEX = re.compile(r"\([^\)]+\)")
+EXTRACT_SOURCE_KEY_REGEX = re.compile(
+    r"(?:in\s+(\w+))\s*$", re.IGNORECASE | re.MULTILINE
+)
+EVAL_REGEX = re.compile(r"EVAL-(?P<FIELD>.*)", re.IGNORECASE)
+FIELDALIAS_REGEX = re.compile(
+    r"(\"(?:\\\"|[^\"])*\"|\'(?:\\\'|[^\'])*\'|[^\s,]+)"
+    r"\s+(?:as(?:new)?)\s+"
+    r"(\"(?:\\\"|[^\"])*\"|\'(?:\\\'|[^\'])*\'|[^\s,]+)",
+    re.IGNORECASE,
+)
+LOOKUP_FIELD_REGEX = re.compile(
+    r"(\"(?:\\\"|[^\"])*\"|\'(?:\\\'|[^\'])*\'|[^\s,]+)\s*(?:[aA][sS]\s*(\"(?:\\\"|[^\"])*\"|\'(?:\\\'|[^\'])*\'|[^\s,]+))?"
+)
+
 class PropsParser(object):
     """
     Parses props.conf and extracts the fields.
     
     Args:
         splunk_app_path (str): Path of the Splunk app
-        app (splunk_appinspect.App): Object of Splunk app
+        app (ConfParser): Object to read the configuration files of the app
     """
 
     def __init__(self, splunk_app_path, app):
@@ -51,7 +78,7 @@ class PropsParser(object):
                     stanza_name,
                 )
                 props_property = stanza.options[classname]
-                if not re.match("REPORT", classname, re.IGNORECASE):
+                if not REPORT_REGEX.match(classname):
                     LOGGER.info("Trying to parse classname=%s", classname)
                     parsing_method = self.get_props_method(classname)
                     if parsing_method:
@@ -84,18 +111,12 @@ class PropsParser(object):
         Returns:
             instance method to parse the property
         """
-        method_mapping = {
-            "EXTRACT": self.get_extract_fields,
-            "EVAL": self.get_eval_fields,
-            "FIELDALIAS": self.get_fieldalias_fields,
-            "LOOKUP": self.get_lookup_fields
-        }
-        for each_type in method_mapping:
-            if re.match(each_type, class_name, re.IGNORECASE):
-                LOGGER.info("Matched method of type=%s", each_type)
-                return method_mapping[each_type]
-        else:
-            LOGGER.warning("No parser available for %s. Skipping...", class_name)
+        match_obj = PROPS_METHOD_REGEX.match(class_name)
+        if match_obj:
+            each_type = match_obj.group().upper()
+            LOGGER.info("Matched method of type=%s", each_type)
+            return getattr(self, PROPS_METHOD_MAPPING[each_type])
+        LOGGER.warning("No parser available for %s. Skipping...", class_name)
 
     def get_props_stanzas(self):
         """
@@ -142,13 +163,13 @@ class PropsParser(object):
             generator of source name
         """
         LOGGER.debug("Finding combinations of a source..")
-        match_obj = re.search(r"source::(.*)", source)
+        match_obj = SOURCE_REGEX.search(source)
         value = match_obj.group(1).replace("...", "*")
-        sub_groups = re.findall(r"\([^\)]+\)", value)
+        sub_groups = SOURCE_GROUP_REGEX.findall(value)
         sub_group_list = []
         for each_group in sub_groups:
             sub_group_list.append(each_group.strip("()").split("|"))
-        template = re.sub(r"\([^\)]+\)", "{}", value)
+        template = SOURCE_GROUP_REGEX.sub("{}", value)
         count = 0
         for each_permutation in product(*sub_group_list):
             count += 1
@@ -166,7 +187,7 @@ class PropsParser(object):
 
 
         Args:
-            props_property (splunk_appinspect.configuration_file.ConfigurationSetting): 
+            props_property (conf_parser.ConfSetting): 
                 The configuration setting object of REPORT.
                 properties used:
 
@@ -176,7 +197,7 @@ class PropsParser(object):
         Yields:
             the sourcetype field with possible value
         """
-        yield Field({
+        yield Field.get_field({
             "name": props_property.name,
             "expected_values": [props_property.value]
         })
@@ -189,7 +210,7 @@ class PropsParser(object):
             EXTRACT-one = regex with (?<capturing_group>.*)
 
         Args:
-            props_property (splunk_appinspect.configuration_file.ConfigurationSetting): 
+            props_property (conf_parser.ConfSetting): 
                 The configuration setting object of EXTRACT.
                 properties used:
 
@@ -206,18 +227,14 @@ class PropsParser(object):
         Yields:
             generator of fields
         """
-        regex = r"\(\?P?(?:[<'])([^\>'\s]+)[\>']"
         fields_group = []
-        for field in re.findall(regex, props_property.value):
+        for field in CAPTURE_GROUP_REGEX.findall(props_property.value):
             if not field.startswith(("_KEY_", "_VAL_")):
                 fields_group.append(field)
                 yield field
 
         # If SOURCE_KEY is used in EXTRACT, generate the test for the same.
-        regex_for_source_key = r"(?:(?i)in\s+(\w+))\s*$"
-        extract_source_key = re.search(
-            regex_for_source_key, props_property.value, re.MULTILINE
-        )
+        extract_source_key = EXTRACT_SOURCE_KEY_REGEX.search(props_property.value)
         if extract_source_key:
             LOGGER.info("Found a source key in %s", props_property.name)
             yield extract_source_key.group(1)
@@ -232,7 +249,7 @@ class PropsParser(object):
             EVAL-action = if(isnull(action), "unknown", action)
 
         Args:
-            props_property (splunk_appinspect.configuration_file.ConfigurationSetting): 
+            props_property (conf_parser.ConfSetting): 
                 The configuration setting object of eval
                 properties used:
 
@@ -242,8 +259,7 @@ class PropsParser(object):
         Yields:
             generator of fields
         """
-        regex = r"EVAL-(?P<FIELD>.*)"
-        yield from re.findall(regex, props_property.name, re.IGNORECASE)
+        yield from EVAL_REGEX.findall(props_property.name)
 
 
     @convert_to_fields
@@ -254,7 +270,7 @@ class PropsParser(object):
             FIELDALIAS-class = source AS dest, sc2 AS dest2
 
         Args:
-            props_property (splunk_appinspect.configuration_file.ConfigurationSetting): 
+            props_property (conf_parser.ConfSetting): 
                 The configuration setting object of FIELDALIAS
                 properties used:
 
@@ -276,14 +292,9 @@ class PropsParser(object):
         Yields:
             generator of fields
         """
-        regex = (
-            r"(\"(?:\\\"|[^\"])*\"|\'(?:\\\'|[^\'])*\'|[^\s,]+)"
-            r"\s+(?i)(?:as(?:new)?)\s+"
-            r"(\"(?:\\\"|[^\"])*\"|\'(?:\\\'|[^\'])*\'|[^\s,]+)"
-        )
-        fields_tuples = re.findall(regex, props_property.value, re.IGNORECASE)
-        # Convert list of tuples into list
-        return list(set([item for t in fields_tuples for item in t]))
+        fields_tuples = FIELDALIAS_REGEX.findall(props_property.value)
+        # Convert list of tuples into list, the order is kept for the test ids
+        return list(dict.fromkeys(item for t in fields_tuples for item in t))
 
 
     def get_report_fields(self, props_property):
@@ -292,7 +303,7 @@ class PropsParser(object):
         In order to parse the fields REPORT, the method parses the 
             transforms.conf and returns the list
         Args:
-            props_property (splunk_appinspect.configuration_file.ConfigurationSetting): 
+            props_property (conf_parser.ConfSetting): 
                 The configuration setting object of REPORT.
                 properties used:
 
@@ -317,7 +328,7 @@ class PropsParser(object):
         Extracts the lookup fields 
 
         Args:
-            props_property (splunk_appinspect.configuration_file.ConfigurationSetting): 
+            props_property (conf_parser.ConfSetting): 
                 The configuration setting object of eval
                 properties used:
 
@@ -338,7 +349,7 @@ class PropsParser(object):
             lookup_field_list += list(
                     self.transforms_parser.get_lookup_csv_fields(parsed_fields["lookup_stanza"])
                 )
-        return list(set(lookup_field_list))
+        return list(dict.fromkeys(lookup_field_list))
 
 
     def parse_lookup_str(self, lookup_str):
@@ -378,9 +389,8 @@ class PropsParser(object):
                 "OUTPUT"
             )[input_output_index]
 
-            field_parser = r"(\"(?:\\\"|[^\"])*\"|\'(?:\\\'|[^\'])*\'|[^\s,]+)\s*(?:[aA][sS]\s*(\"(?:\\\"|[^\"])*\"|\'(?:\\\'|[^\'])*\'|[^\s,]+))?"
             # field_groups: Group of max 2 fields - (source, destination) for "source as destination"
-            field_groups = re.findall(field_parser, input_output_str)
+            field_groups = LOOKUP_FIELD_REGEX.findall(input_output_str)
 
             field_list = []
             # Take the last non-empty field from a field group.
@@ -5,23 +5,37 @@ Provides transforms.conf parsing mechanism
 import logging
 import re
 import os
+import io
 import csv 
+import mmap
 from urllib.parse import unquote
 LOGGER = logging.getLogger("pytest-splunk-addon")
 
 from . import convert_to_fields
 
+# The regex are compiled once for all the stanzas of all the transforms.conf
+CAPTURE_GROUP_REGEX = re.compile(r"\(\?P?(?:[<'])([^\>'\s]+)[\>']")
+FORMAT_FIELD_REGEX = re.compile(r"(\S*)::")
+
+# (path, mtime) of the lookup file -> header of the lookup file
+LOOKUP_HEADER_CACHE = {}
+
 class TransformsParser(object):
     """
     Parses transforms.conf and extracts fields 
+    The fields of a stanza are parsed once and reused for every props
+    stanza which refers to it.
+
     Args:
         splunk_app_path (str): Path of the Splunk app
-        app (splunk_appinspect.App): Object of Splunk app
+        app (ConfParser): Object to read the configuration files of the app
     """
     def __init__(self, splunk_app_path, app):
         self.app = app 
         self.splunk_app_path = splunk_app_path
         self._transforms = None
+        self._transform_fields = {}
+        self._lookup_csv_fields = {}
 
     @property
     def transforms(self):
@@ -58,7 +72,13 @@ class TransformsParser(object):
         Yields:
             generator of fields
         """
+        if transforms_stanza not in self._transform_fields:
+            self._transform_fields[transforms_stanza] = list(
+                self._parse_transform_fields(transforms_stanza)
+            )
+        yield from self._transform_fields[transforms_stanza]
 
+    def _parse_transform_fields(self, transforms_stanza):
         try:
             if not self.transforms:
                 return
@@ -70,8 +90,9 @@ class TransformsParser(object):
             if "REGEX" in transforms_section.options:
                 LOGGER.info("Parsing REGEX of %s", transforms_stanza)
 
-                regex = r"\(\?P?(?:[<'])([^\>'\s]+)[\>']"
-                match_fields = re.findall(regex, transforms_section.options["REGEX"].value)
+                match_fields = CAPTURE_GROUP_REGEX.findall(
+                    transforms_section.options["REGEX"].value
+                )
                 for each_field in match_fields:
                     if not each_field.startswith(("_KEY_", "_VAL_")):
                         yield each_field.strip()
@@ -83,8 +104,9 @@ class TransformsParser(object):
 
             if "FORMAT" in transforms_section.options:
                 LOGGER.info("Parsing FORMAT of %s", transforms_stanza)
-                regex = r"(\S*)::"
-                match_fields = re.findall(regex, transforms_section.options["FORMAT"].value)
+                match_fields = FORMAT_FIELD_REGEX.findall(
+                    transforms_section.options["FORMAT"].value
+                )
                 for each_field in match_fields:
                     if not "$" in each_field:
                         yield each_field.strip()
@@ -106,6 +128,13 @@ class TransformsParser(object):
         Yields:
             string of field names  
         """
+        if lookup_stanza not in self._lookup_csv_fields:
+            self._lookup_csv_fields[lookup_stanza] = list(
+                self._parse_lookup_csv_fields(lookup_stanza)
+            )
+        yield from self._lookup_csv_fields[lookup_stanza]
+
+    def _parse_lookup_csv_fields(self, lookup_stanza):
         if not self.transforms:
             return
         if lookup_stanza in self.transforms.sects:
@@ -116,11 +145,9 @@ class TransformsParser(object):
                     location = os.path.join(
                         self.splunk_app_path, "lookups", lookup_file
                     )
-                    with open(location, "r") as csv_file:
-                        reader = csv.DictReader(csv_file)
-                        fieldnames = reader.fieldnames
-                        for items in fieldnames:
-                            yield items.strip()
+                    fieldnames = get_csv_header(location)
+                    for items in fieldnames:
+                        yield items.strip()
                 # If there is an error. the test should fail with the current fields
                 # This makes sure the test doesn't exit prematurely
                 except (OSError, IOError, UnboundLocalError, TypeError) as e:
@@ -128,3 +155,53 @@ class TransformsParser(object):
                         "Could not read the lookup file, skipping test. error=%s",
                         str(e),
                     )
+
+
+def get_csv_header(csv_path):
+    """
+    Get the header of a csv file. The header of a file is read once
+    for each modification of the file.
+
+    Args:
+        csv_path (str): Path of the csv file
+
+    Returns:
+        list of the column names. None if the file is empty.
+    """
+    cache_key = (os.path.abspath(csv_path), os.stat(csv_path).st_mtime_ns)
+    if cache_key not in LOOKUP_HEADER_CACHE:
+        LOOKUP_HEADER_CACHE[cache_key] = read_csv_header(csv_path)
+    return LOOKUP_HEADER_CACHE[cache_key]
+
+
+def read_csv_header(csv_path):
+    """
+    Read the header of a csv file without reading the rest of the file.
+    The file is memory mapped and scanned up to the first line break
+    which is not inside a quoted value.
+
+    Args:
+        csv_path (str): Path of the csv file
+
+    Returns:
+        list of the column names. None if the file is empty.
+    """
+    with open(csv_path, "rb") as csv_file:
+        if not os.fstat(csv_file.fileno()).st_size:
+            return None
+        with mmap.mmap(csv_file.fileno(), 0, access=mmap.ACCESS_READ) as csv_map:
+            header_end = len(csv_map)
+            quote_count = 0
+            line_start = 0
+            while True:
+                line_end = csv_map.find(b"\n", line_start)
+                if line_end == -1:
+                    break
+                quote_count += csv_map[line_start:line_end].count(b'"')
+                # An even number of quotes means the line break is not quoted
+                if quote_count % 2 == 0:
+                    header_end = line_end + 1
+                    break
+                line_start = line_end + 1
+            header = csv_map[:header_end].decode("utf-8-sig", errors="replace")
+    return next(csv.reader(io.StringIO(header, newline="")), [])
@@ -5,10 +5,16 @@ Generates test cases of Fields and CIM.
 """
 import logging
 import os
+import pickle
+import zlib
+
+import pytest
 from .fields_tests import FieldTestGenerator
 from .cim_tests import CIMTestGenerator
 
 LOGGER = logging.getLogger("pytest-splunk-addon")
+# The data models used if --splunk-dm-path is not provided
+DATA_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_models")
 
 
 class AppTestGenerator(object):
@@ -16,26 +22,44 @@ class AppTestGenerator(object):
     Test Generator for an App.
     Generates test cases of Fields and CIM.
 
+    The test cases can be generated once and shared with other processes
+    through a manifest, See get_manifest & load_manifest.
+
     Args:
         pytest_config: To get the options given to pytest
     """
 
+    # The fixtures used by the test templates
+    SEARCHTIME_FIXTURES = [
+        "splunk_searchtime_fields_positive",
+        "splunk_searchtime_fields_negative",
+        "splunk_searchtime_fields_tags",
+        "splunk_searchtime_fields_eventtypes",
+        "splunk_searchtime_cim_fields",
+        "splunk_searchtime_cim_fields_not_allowed_in_props",
+        "splunk_searchtime_cim_fields_not_allowed_in_search",
+    ]
+
     def __init__(self, pytest_config):
         self.pytest_config = pytest_config
-        self.seen_tests = set()
+        # fixture -> ids of the generated test cases
+        self.seen_tests = {}
+        self.manifest = {}
+        # The parsed add-on and the validated data models are persisted
+        # in .pytest_cache unless the cacheprovider plugin is disabled
+        cache = getattr(self.pytest_config, "cache", None)
         LOGGER.debug("Initializing FieldTestGenerator to generate the test cases")
         self.fieldtest_generator = FieldTestGenerator(
             self.pytest_config.getoption("splunk_app"),
             field_bank=self.pytest_config.getoption("field_bank", False),
+            cache=cache,
         )
 
-        data_model_path = os.path.join(
-            os.path.dirname(os.path.abspath(__file__)), "data_models"
-        )
         LOGGER.debug("Initializing CIMTestGenerator to generate the test cases")
         self.cim_test_generator = CIMTestGenerator(
             self.pytest_config.getoption("splunk_app"),
-            self.pytest_config.getoption("splunk_dm_path") or data_model_path,
+            self.pytest_config.getoption("splunk_dm_path") or DATA_MODEL_PATH,
+            cache=cache,
         )
 
     def generate_tests(self, fixture):
@@ -48,7 +72,10 @@ class AppTestGenerator(object):
         Args:
             fixture(str): fixture name
         """
-        if fixture.startswith("splunk_searchtime_fields"):
+        if fixture in self.manifest:
+            for param_id, param_values, param_marks in self.manifest[fixture]:
+                yield pytest.param(*param_values, id=param_id, marks=param_marks)
+        elif fixture.startswith("splunk_searchtime_fields"):
             yield from self.dedup_tests(
                 self.fieldtest_generator.generate_tests(fixture),
                 fixture
@@ -63,6 +90,11 @@ class AppTestGenerator(object):
         """
         Deduplicate the test case parameters based on param.id
 
+        ACD-4138: pytest-xdist expects the tests to be in the same order in
+        all the workers. The generators yield the tests in the order of the
+        configuration files & data models, which is the same in every
+        process, so the params are streamed without sorting them.
+
         Args:
             test_list (Generator): Generator of pytest.param
             fixture (str): fixture name
@@ -70,12 +102,36 @@ class AppTestGenerator(object):
         Yields:
             Generator: De-duplicated pytest.param
         """
-        param_list = []
+        seen_tests = self.seen_tests.setdefault(fixture, set())
         for each_param in test_list:
-            if (fixture, each_param.id) not in self.seen_tests:
-                param_list.append(each_param)
-                self.seen_tests.add((fixture, each_param.id))
+            if each_param.id not in seen_tests:
+                seen_tests.add(each_param.id)
+                yield each_param
+
+    def get_manifest(self):
+        """
+        Generate the test cases of all the SEARCHTIME_FIXTURES and serialize
+        them, so that the other processes do not have to parse the add-on
+        and generate the test cases again.
 
-        # Sort the test generated.
-        # ACD-4138: As pytest-xdist expects the tests to be ordered
-        return sorted(param_list, key=lambda param: param.id)
+        Returns:
+            bytes: compressed pickle of fixture -> list of (id, values, marks)
+        """
+        manifest = {
+            fixture: [
+                (each_param.id, each_param.values, list(each_param.marks))
+                for each_param in self.generate_tests(fixture)
+            ]
+            for fixture in self.SEARCHTIME_FIXTURES
+        }
+        return zlib.compress(pickle.dumps(manifest, pickle.HIGHEST_PROTOCOL))
+
+    def load_manifest(self, manifest):
+        """
+        Load the test cases generated by another process. The test cases
+        of the fixtures in the manifest are not generated again.
+
+        Args:
+            manifest (bytes): manifest created by get_manifest
+        """
+        self.manifest = pickle.loads(zlib.decompress(manifest))
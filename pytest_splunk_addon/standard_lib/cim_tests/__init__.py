@@ -7,5 +7,6 @@ from .json_schema import JSONSchema
 from .data_set import DataSet
 from .data_model import DataModel
 from .data_model_handler import DataModelHandler
+from .batch_search import DataSetBatchSearch
 from .test_generator import CIMTestGenerator
 from .test_templates import CIMTestTemplates
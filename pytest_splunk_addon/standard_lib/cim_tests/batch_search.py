@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Batches the CIM field tests of a data set into a single search.
+"""
+import logging
+
+from .field_test_helper import FieldTestHelper
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+
+
+class DataSetBatchSearch(object):
+    """
+    Executes one search per tag stanza & data set for all the CIM field
+    tests collected in the session and caches the results.
+
+    Instead of dispatching a search for each required field and field
+    cluster, all the fields of the data set are folded into a single
+    search made by FieldTestHelper::
+
+        <base_search> <condition>
+        | eval <validity of each field> ...
+        | stats count as event_count, count(field) as field_count, ...
+            by sourcetype, source
+
+    The conditions of the fields limit the events of the search, so the
+    tests are batched by the condition of their fields as well. The tests
+    of the fields without a condition share a single search.
+
+    The search of a batch is executed when the first test of the batch
+    asks for its results.
+
+    Args:
+        search_util (SearchUtil): the util class to search on the Splunk instance
+        test_params (list): splunk_searchtime_cim_fields params of the session
+        interval (int): at what interval each retry should be made
+        retries (int): number of retries to make if no results found
+    """
+
+    def __init__(self, search_util, test_params, interval=3, retries=3):
+        self.search_util = search_util
+        self.interval = interval
+        self.retries = retries
+        # batch key -> field name -> Field
+        self._batch_fields = {}
+        # batch key -> (search, results)
+        self._batch_results = {}
+        for each_param in test_params:
+            self.add_test(each_param)
+
+    def add_test(self, test_param):
+        """
+        Add the fields of a test case to the batch of its data set
+
+        Args:
+            test_param (dict): parameter of splunk_searchtime_cim_fields
+        """
+        batch_fields = self._batch_fields.setdefault(self._get_batch_key(test_param), {})
+        for each_field in test_param["fields"]:
+            batch_fields.setdefault(each_field.name, each_field)
+
+    def get_results(self, test_param):
+        """
+        Get the batch search and its results for a test case.
+        Executes the batch search if not executed already.
+
+        Args:
+            test_param (dict): parameter of splunk_searchtime_cim_fields
+
+        Returns:
+            tuple: (search, results) to be parsed with
+                FieldTestHelper.parse_search_results. None if the test case
+                was not batched or the batch search failed.
+        """
+        batch_key = self._get_batch_key(test_param)
+        batch_fields = self._batch_fields.get(batch_key)
+        if batch_fields is None:
+            return None
+        # A different field with the same name can not be in the same search
+        for each_field in test_param["fields"]:
+            batch_field = batch_fields.get(each_field.name)
+            if batch_field is None or batch_field.key != each_field.key:
+                return None
+        if batch_key not in self._batch_results:
+            self._batch_results[batch_key] = self._search_batch(
+                batch_key, list(batch_fields.values())
+            )
+        return self._batch_results[batch_key]
+
+    def _search_batch(self, batch_key, fields):
+        """
+        Execute the batch search of a data set
+
+        Args:
+            batch_key (tuple): (base_search, condition)
+            fields (list): all the fields of the batch
+
+        Returns:
+            tuple: (search, results). None if the search failed.
+        """
+        base_search, condition = batch_key
+        test_helper = FieldTestHelper(
+            self.search_util, fields, interval=self.interval, retries=self.retries
+        )
+        try:
+            test_helper.test_field(base_search, condition)
+            LOGGER.info("Executed the batch search query: %s", test_helper.search)
+            return test_helper.search, test_helper.results
+        # The tests fall back to their own search if the batch fails
+        except Exception as e:
+            LOGGER.warning(
+                "Batch search failed for search=%s. error=%s", base_search, str(e)
+            )
+            return None
+
+    @staticmethod
+    def get_base_search(tag_stanza, data_set):
+        """
+        Get the search which finds the events of a data set mapped with a
+        tag stanza
+
+        Args:
+            tag_stanza (str): the tag stanza. Ex, eventtype="sample"
+            data_set (list): the data set with its parent data sets
+        """
+        base_search = ""
+        for each_set in data_set:
+            base_search += " | search {}".format(each_set.search_constraints)
+        base_search += " | search {}".format(tag_stanza)
+        return base_search
+
+    @classmethod
+    def _get_batch_key(cls, test_param):
+        condition = " AND ".join(
+            [each_field.condition for each_field in test_param["fields"] if each_field.condition]
+        )
+        return (
+            cls.get_base_search(test_param["tag_stanza"], test_param["data_set"]),
+            condition,
+        )
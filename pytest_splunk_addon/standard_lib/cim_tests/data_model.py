@@ -47,7 +47,7 @@ class DataModel(object):
         Yields:
             data_set.DataSet: data set object mapped with the tags
         """
-        yield from self._get_mapped_datasets(addon_tags, self.root_data_set)
+        yield from self._get_mapped_datasets(frozenset(addon_tags), self.root_data_set)
 
     def __str__(self):
         return str(self.name)
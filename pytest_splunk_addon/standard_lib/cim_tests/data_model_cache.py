@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Provides the persistent cache of the validated data model JSON files
+"""
+import logging
+
+from ..fingerprint_cache import FingerprintCache
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+
+
+class DataModelCache(FingerprintCache):
+    """
+    Stores the validated data model JSON files of a directory as a single
+    bundle in the pytest cache, so that the data models are validated only
+    once across the pytest processes and sessions.
+
+    Each data model is validated again only if its file changed, See
+    FingerprintCache. All the data models are validated again if the
+    schema changes.
+
+    Args:
+        cache (_pytest.cacheprovider.Cache): The pytest cache (config.cache)
+        data_model_path (str): path to the data model JSON files
+        schema_path (str): path of the schema the data models are validated with
+    """
+
+    CACHE_KEY = "pytest-splunk-addon/data_models/{}"
+    VERSION = 2
+
+    def __init__(self, cache, data_model_path, schema_path):
+        super(DataModelCache, self).__init__(cache, data_model_path)
+        self.data_model_path = data_model_path
+        self.schema_path = schema_path
+        self._schema_hash = None
+        self._data_models = None
+        self._is_changed = False
+
+    @property
+    def data_models(self):
+        """
+        The cached data models, file name mapped with the cache entry.
+        Loaded from the pytest cache in a single read.
+        """
+        if self._data_models is None:
+            bundle = self.load_entry()
+            if bundle and bundle.get("schema") == self.schema_hash:
+                self._data_models = bundle["data_models"]
+            else:
+                self._data_models = {}
+        return self._data_models
+
+    @property
+    def schema_hash(self):
+        if not self._schema_hash:
+            self._schema_hash = self.get_hash(self.schema_path)
+        return self._schema_hash
+
+    def get(self, file_name):
+        """
+        Get the validated data model of a file
+
+        Args:
+            file_name (str): name of the data model JSON file
+
+        Returns:
+            dict: the data model JSON. None if it is not cached or the file
+                changed since it was cached.
+        """
+        entry = self.data_models.get(file_name)
+        if not entry:
+            return None
+        if not self.is_unchanged(file_name, entry["fingerprint"]):
+            LOGGER.info("The data model %s changed since it was validated.", file_name)
+            return None
+        return entry["data_model"]
+
+    def set(self, file_name, data_model):
+        """
+        Add the validated data model of a file to the bundle
+
+        Args:
+            file_name (str): name of the data model JSON file
+            data_model (dict): the validated data model JSON
+        """
+        self.data_models[file_name] = {
+            "fingerprint": self.get_fingerprint(file_name),
+            "data_model": data_model,
+        }
+        self._is_changed = True
+
+    def save(self, file_names):
+        """
+        Save the bundle to the pytest cache if any data model was validated.
+        The entries of the files which no longer exist are removed.
+
+        Args:
+            file_names (list): names of the data model JSON files in the directory
+        """
+        removed_files = set(self.data_models) - set(file_names)
+        for each_file in removed_files:
+            del self.data_models[each_file]
+        if not (self._is_changed or removed_files):
+            return
+        self.save_entry({"schema": self.schema_hash, "data_models": self.data_models})
+        self._is_changed = False
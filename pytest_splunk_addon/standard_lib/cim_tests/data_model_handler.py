@@ -4,6 +4,7 @@ Provides Data Model handling functionalities. Such as
 
 * Parse all the data model JSON files
 * Get Mapped data model for an eventtype 
+* Cache the validated data models in the pytest cache (optional)
 """
 import os
 import logging
@@ -11,6 +12,7 @@ import logging
 import json
 from . import DataModel
 from . import JSONSchema
+from .data_model_cache import DataModelCache
 
 LOGGER = logging.getLogger("pytest-splunk-addon")
 
@@ -23,11 +25,16 @@ class DataModelHandler(object):
 
     Args:
         data_model_path (str): path to the data model JSON files
+        cache (_pytest.cacheprovider.Cache): The pytest cache to persist
+            the validated data models (optional)
     """
 
-    def __init__(self, data_model_path):
+    def __init__(self, data_model_path, cache=None):
         self.data_model_path = data_model_path
+        self.cache = cache
         self._data_models = None
+        self._mapping_order = None
+        self._tag_index = None
 
     @property
     def data_models(self):
@@ -35,6 +42,54 @@ class DataModelHandler(object):
             self._data_models= list(self.load_data_models(self.data_model_path))
         return self._data_models
 
+    @property
+    def tag_index(self):
+        """
+        Inverted index of the tags of the data sets, built once when the
+        data models are loaded
+
+            {
+                tag: {positions of the data sets with the tag in mapping_order}
+            }
+
+        The data sets with an empty tag group are mapped with any tags,
+        those are indexed with the None key.
+        """
+        if self._tag_index is None:
+            self._build_tag_index()
+        return self._tag_index
+
+    @property
+    def mapping_order(self):
+        """
+        All the data sets of the data models in the order of mapping,
+        the data models in order and the data sets of a data model depth first
+
+            [(data_model, [parent data sets..., data set])]
+        """
+        if self._mapping_order is None:
+            self._build_tag_index()
+        return self._mapping_order
+
+    def _build_tag_index(self):
+        mapping_order = []
+        tag_index = {}
+
+        def add_data_sets(data_model, data_sets, parent_list):
+            for each_data_set in data_sets:
+                dataset_list = parent_list + [each_data_set]
+                position = len(mapping_order)
+                mapping_order.append((data_model, dataset_list))
+                for each_tag_group in each_data_set.tags:
+                    for each_tag in each_tag_group or [None]:
+                        tag_index.setdefault(each_tag, set()).add(position)
+                add_data_sets(data_model, each_data_set.child_dataset, dataset_list)
+
+        for each_data_model in self.data_models:
+            add_data_sets(each_data_model, each_data_model.root_data_set, [])
+        self._mapping_order = mapping_order
+        self._tag_index = tag_index
+
 
     def _get_all_tags_per_stanza(self, addon_parser):
         """
@@ -62,19 +117,35 @@ class DataModelHandler(object):
 
     def load_data_models(self, data_model_path):
         """
-        Parse all the data model JSON files one by one
+        Parse all the data model JSON files one by one.
+        If the pytest cache is provided, the validated data models are loaded
+        from the cache and only the changed files are validated again.
 
         Yields:
             (data_model.DataModel): parsed data model object 
         """
         # Parse each fields and load data models
-        json_list = [
+        json_list = sorted(
             each for each in os.listdir(data_model_path) if each.endswith(".json")
-        ]
+        )
+        if self.cache is None:
+            for each_json in json_list:
+                yield DataModel(
+                    JSONSchema.parse_data_model(os.path.join(data_model_path, each_json))
+                )
+            return
+        data_model_cache = DataModelCache(
+            self.cache, data_model_path, JSONSchema().schema_path
+        )
         for each_json in json_list:
-            yield DataModel(
-                JSONSchema.parse_data_model(os.path.join(data_model_path, each_json))
-            )
+            json_data = data_model_cache.get(each_json)
+            if json_data is None:
+                json_data = JSONSchema.parse_data_model(
+                    os.path.join(data_model_path, each_json)
+                )
+                data_model_cache.set(each_json, json_data)
+            yield DataModel(json_data)
+        data_model_cache.save(json_list)
 
     def get_mapped_data_models(self, addon_parser):
         """
@@ -93,13 +164,31 @@ class DataModelHandler(object):
 
         tags_in_each_stanza = self._get_all_tags_per_stanza(addon_parser)
         for eventtype, tags in tags_in_each_stanza.items():
-            is_mapped_datasets = False
-            for each_data_model in self.data_models:
-                mapped_datasets = list(each_data_model.get_mapped_datasets(tags))
-                if mapped_datasets:
-                    is_mapped_datasets = True
-                    LOGGER.info("Data Model=%s mapped for %s", each_data_model, eventtype)
-                    for each_mapped_dataset in mapped_datasets:
-                        yield eventtype, each_mapped_dataset
-            if not is_mapped_datasets:
+            tags = frozenset(tags)
+            # Only the data sets which have at least one of the tags can be mapped
+            candidates = self.tag_index.get(None, set()).union(
+                *(self.tag_index.get(each_tag, ()) for each_tag in tags)
+            )
+            mapped_positions = sorted(
+                position
+                for position in candidates
+                if self.mapping_order[position][1][-1].match_tags(tags)
+            )
+            mapped_datasets = {
+                self.mapping_order[position][1][-1] for position in mapped_positions
+            }
+            mapped_data_models = []
+            for position in mapped_positions:
+                data_model, dataset_list = self.mapping_order[position]
+                # A child data set is mapped only if its parents are mapped
+                if not all(
+                    each_data_set in mapped_datasets
+                    for each_data_set in dataset_list[:-1]
+                ):
+                    continue
+                if data_model not in mapped_data_models:
+                    mapped_data_models.append(data_model)
+                    LOGGER.info("Data Model=%s mapped for %s", data_model, eventtype)
+                yield eventtype, list(dataset_list)
+            if not mapped_data_models:
                 LOGGER.info("No Data Model mapped for %s", eventtype)
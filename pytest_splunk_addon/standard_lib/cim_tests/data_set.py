@@ -13,7 +13,9 @@ class DataSet(object):
     """
     def __init__(self, data_set_json):
         self.name = data_set_json.get("name")
-        self.tags = data_set_json.get("tags")
+        self.tags = [
+            frozenset(each_tag_group) for each_tag_group in data_set_json.get("tags") or []
+        ]
         self.child_dataset = list(self.load_dataset(data_set_json.get("child_dataset")))
         self.fields = list(Field.parse_fields(
             data_set_json.get("fields"),
@@ -64,9 +66,15 @@ class DataSet(object):
     def match_tags(self, addon_tag_list):
         """
         Check if the tags are mapped with this data set
+
+        Args:
+            addon_tag_list (list): tags mapped with a stanza. Pass a frozenset
+                to avoid converting the tags for each data set.
         """
+        if not isinstance(addon_tag_list, (set, frozenset)):
+            addon_tag_list = frozenset(addon_tag_list)
         for each_tag_group in self.tags:
-            if set(each_tag_group).issubset(set(addon_tag_list)):
+            if each_tag_group.issubset(addon_tag_list):
                 return True
 
     def __str__(self):
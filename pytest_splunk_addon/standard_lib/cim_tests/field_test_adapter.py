@@ -15,9 +15,13 @@ class FieldTestAdapater(Field):
     FIELD_COUNT = "{}_count"
     VALID_FIELD_COUNT = "{}_valid_count"
     INVALID_FIELD_VALUES = "{}_invalid_values"
+    __slots__ = ("valid_field", "invalid_field", "validity_query")
+    # The adapter is mutable, the validity query is generated lazily
+    __setattr__ = object.__setattr__
 
     def __init__(self, field):
-        self.__dict__ = field.__dict__.copy()
+        for each_slot in Field.__slots__:
+            self._set(each_slot, getattr(field, each_slot))
         self.valid_field = self.VALID_FIELD.format(field)
         self.invalid_field = self.INVALID_FIELD.format(field)
         self.validity_query = None
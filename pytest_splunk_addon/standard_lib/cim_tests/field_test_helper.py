@@ -26,7 +26,7 @@ class FieldTestHelper(object):
         self.interval = interval
         self.retries = retries
 
-    def test_field(self, base_search):
+    def test_field(self, base_search, condition=None):
         """
         Generate a query for the list of fields and return the result 
         Format of the query is
@@ -42,12 +42,14 @@ class FieldTestHelper(object):
 
         Args:
             base_search (str): Base search. Must be a search command.
+            condition (str): Condition of the events to test.
+                The conditions of the fields by default.
 
         Yields:
             dict: with source, sourcetype, field, event_count, field_count,
              valid_field_count, invalid_values keys
         """
-        self._make_search_query(base_search)
+        self._make_search_query(base_search, condition)
         self.logger.info(f"Executing the search query: {self.search}")
         self.results = list(
             self.search_util.getFieldValuesList(
@@ -56,7 +58,23 @@ class FieldTestHelper(object):
         )
         return self._parse_result(self.results)
 
-    def _make_search_query(self, base_search):
+    def parse_search_results(self, search, results):
+        """
+        Parse the results of a search executed for the fields of the helper
+        along with other fields. Ex, the batch search of a data set.
+
+        Args:
+            search (str): the search which was executed
+            results (list): results of the search
+
+        Returns:
+            list: same as test_field
+        """
+        self.search = search
+        self.results = results
+        return self._parse_result(self.results)
+
+    def _make_search_query(self, base_search, condition=None):
         """
         Make the search query by using the list of fields 
 
@@ -71,8 +89,11 @@ class FieldTestHelper(object):
 
         Args:
             base_search (str): The base search 
+            condition (str): Condition of the events, the conditions of the fields by default
         """
-        self.search = f"{base_search} {self._gen_condition()}"
+        if condition is None:
+            condition = self._gen_condition()
+        self.search = f"{base_search} {condition}"
         self.search_event = self.search
         for each_field in self.fields:
             self.search += each_field.gen_validity_query()
@@ -19,6 +19,8 @@ class JSONSchema(BaseSchema):
     """
 
     SCHEMA_FILE = "DatamodelSchema.json"
+    # Validators compiled from the schema files, shared across the instances
+    VALIDATORS = {}
 
     def __init__(
         self, schema_path=None,
@@ -27,6 +29,18 @@ class JSONSchema(BaseSchema):
             op.dirname(op.abspath(__file__)), self.SCHEMA_FILE
         )
 
+    @property
+    def validator(self):
+        """
+        Draft7Validator of the schema, compiled only once per schema file
+        """
+        if self.schema_path not in self.VALIDATORS:
+            with open(self.schema_path, "r") as schema_f:
+                self.VALIDATORS[self.schema_path] = Draft7Validator(
+                    json.load(schema_f)
+                )
+        return self.VALIDATORS[self.schema_path]
+
     @classmethod
     def parse_data_model(cls, file_path):
         """
@@ -35,11 +49,10 @@ class JSONSchema(BaseSchema):
             schema_path (str): Relative or absolute path of the data model json file
         """
         try:
-            with open(cls().schema_path, "r",) as schema_f:
-                json_schema = json.load(schema_f)
+            validator = cls().validator
             with open(file_path, "r") as json_f:
                 json_data = json.load(json_f)
-                errors = Draft7Validator(json_schema).iter_errors(json_data)
+                errors = validator.iter_errors(json_data)
                 error_location, exc = "", ""
                 LOGGER.info("Validating {}".format(file_path))
                 for error in errors:
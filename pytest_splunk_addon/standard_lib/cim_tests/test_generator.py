@@ -25,6 +25,9 @@ class CIMTestGenerator(object):
             For which types of fields, the test cases should be generated
         common_fields_path (str): 
             Relative or absolute path of the json file with common fields
+        cache (_pytest.cacheprovider.Cache):
+            The pytest cache to persist the parsed add-on and the validated
+            data models (optional)
     """
 
     COMMON_FIELDS_PATH = "CommonFields.json"
@@ -35,10 +38,11 @@ class CIMTestGenerator(object):
         data_model_path,
         test_field_type=["required", "conditional"],
         common_fields_path=None,
+        cache=None,
     ):
 
-        self.data_model_handler = DataModelHandler(data_model_path)
-        self.addon_parser = AddonParser(addon_path)
+        self.data_model_handler = DataModelHandler(data_model_path, cache=cache)
+        self.addon_parser = AddonParser(addon_path, cache=cache)
         self.test_field_type = test_field_type
         self.common_fields_path = common_fields_path or op.join(
             op.dirname(op.abspath(__file__)), self.COMMON_FIELDS_PATH
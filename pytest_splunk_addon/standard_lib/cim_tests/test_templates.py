@@ -5,6 +5,7 @@ Includes the test scenarios to check the CIM compatibility of an Add-on.
 import logging
 import pytest
 from .field_test_helper import FieldTestHelper
+from .batch_search import DataSetBatchSearch
 
 INTERVAL = 3
 RETRIES = 3
@@ -22,11 +23,48 @@ class CIMTestTemplates(object):
     """
 
     logger = logging.getLogger("pytest-splunk-addon-cim-tests")
+    MAPPED_EVENTTYPE_SEARCH = "| tstats count from datamodel={datamodel} {where} by eventtype"
+    # Exclude the internal search logs in the results
+    DATA_MODEL_CONSTRAINTS = {"Splunk_Audit": 'WHERE index!="_*"'}
+    INSTALLED_DATA_MODELS_SEARCH = (
+        "| rest /servicesNS/-/-/datamodel/model splunk_server=local count=0"
+        " | fields title"
+    )
+    # The data models of the Splunk Common Information Model add-on
+    CIM_DATA_MODELS = (
+        "Alerts",
+        "Authentication",
+        "Certificates",
+        "Change",
+        "Compute_Inventory",
+        "DLP",
+        "Databases",
+        "Email",
+        "Endpoint",
+        "Event_Signatures",
+        "Interprocess_Messaging",
+        "Intrusion_Detection",
+        "JVM",
+        "Malware",
+        "Network_Resolution",
+        "Network_Sessions",
+        "Network_Traffic",
+        "Performance",
+        "Splunk_Audit",
+        "Ticket_Management",
+        "Updates",
+        "Vulnerabilities",
+        "Web",
+    )
 
     @pytest.mark.splunk_searchtime_cim
     @pytest.mark.splunk_searchtime_cim_fields
     def test_cim_required_fields(
-        self, splunk_search_util, splunk_searchtime_cim_fields, record_property
+        self,
+        splunk_search_util,
+        splunk_cim_batch,
+        splunk_searchtime_cim_fields,
+        record_property,
     ):
         """
         Test the the required fields in the data models are extracted with valid values. 
@@ -41,21 +79,21 @@ class CIMTestTemplates(object):
         cim_fields = splunk_searchtime_cim_fields["fields"]
         cim_tag_stanza = splunk_searchtime_cim_fields["tag_stanza"]
         # Search Query
-        base_search = ""
-        for each_set in cim_data_set:
-            base_search += " | search {}".format(each_set.search_constraints)
-
-        base_search += " | search {}".format(
-            cim_tag_stanza
-        )
+        base_search = DataSetBatchSearch.get_base_search(cim_tag_stanza, cim_data_set)
 
         test_helper = FieldTestHelper(
             splunk_search_util, 
             cim_fields,
             interval=INTERVAL, retries=RETRIES
         )
-        # Execute the query and get the results
-        results = test_helper.test_field(base_search)
+        # The batch search of the data set covers all the fields of the data set.
+        # Search individually only if the test was not batched or the batch failed
+        batch_result = splunk_cim_batch.get_results(splunk_searchtime_cim_fields)
+        if batch_result:
+            results = test_helper.parse_search_results(*batch_result)
+        else:
+            # Execute the query and get the results
+            results = test_helper.test_field(base_search)
         record_property("search", test_helper.search)
 
         # All assertion are made in the same tests to make the test report with
@@ -127,60 +165,78 @@ class CIMTestTemplates(object):
     @pytest.mark.splunk_searchtime_cim
     @pytest.mark.splunk_searchtime_cim_mapped_datamodel
     def test_eventtype_mapped_multiple_cim_datamodel(
-        self, splunk_search_util, record_property, caplog
+        self, splunk_search_util, splunk_data_model_handler, record_property, caplog
     ):
         """
         This test case check that event type is not be mapped with more than one data model 
 
+        The data models checked are the CIM data models and the data models
+        loaded for the session which are installed on the search head.
+        A tstats search is dispatched for each of them, the searches run
+        concurrently & the eventtypes of each data model are merged once all
+        the searches finish. A search job which fails is dispatched once
+        more, the test fails if it fails again.
+
         Args:
             splunk_search_util (SearchUtil): Object that helps to search on Splunk.
+            splunk_data_model_handler (DataModelHandler): The data models of the session.
             record_property (fixture): Document facts of test cases.
             caplog (fixture): fixture to capture logs.
         """
 
-        data_models = [
-            "Alerts",
-            "Authentication",
-            "Certificates",
-            "Change",
-            "Compute_Inventory",
-            "DLP",
-            "Databases",
-            "Email",
-            "Endpoint",
-            "Event_Signatures",
-            "Interprocess_Messaging",
-            "Intrusion_Detection",
-            "JVM",
-            "Malware",
-            "Network_Resolution",
-            "Network_Sessions",
-            "Network_Traffic",
-            "Performance",
-            "Splunk_Audit",
-            "Ticket_Management",
-            "Updates",
-            "Vulnerabilities",
-            "Web",
-        ]
-
-        search = ""
-        # Iterate data models list to create a search query
-        for index, datamodel in enumerate(data_models):
-            if index == 0:
-                search += f'| tstats count from datamodel={datamodel}  by eventtype | eval dm_type="{datamodel}"\n'
-            elif datamodel == "Splunk_Audit":
-                # Exclude the internal search logs in the results
-                search += f'| append [| tstats count from datamodel={datamodel} WHERE index!="_*"  by eventtype | eval dm_type="{datamodel}"]\n'
-            else:
-                search += f'| append [| tstats count from datamodel={datamodel}  by eventtype | eval dm_type="{datamodel}"]\n'
-
-        search += """| stats delim=", " dc(dm_type) as datamodel_count, values(dm_type) as datamodels by eventtype | nomv datamodels
-        | where datamodel_count > 1 and eventtype!="err0r"
-        """
+        data_models = set(self.CIM_DATA_MODELS).union(
+            str(each_data_model)
+            for each_data_model in splunk_data_model_handler.data_models
+        )
+        installed_data_models = self._get_installed_data_models(splunk_search_util)
+        if installed_data_models is not None:
+            missing_data_models = sorted(data_models - installed_data_models)
+            if missing_data_models:
+                self.logger.info(
+                    "The data models %s are not installed, they are not checked.",
+                    ", ".join(missing_data_models),
+                )
+                record_property("missing_datamodels", missing_data_models)
+            data_models &= installed_data_models
+        if not data_models:
+            pytest.skip("None of the data models is installed on the search head")
+        data_models = sorted(data_models)
+        searches = {
+            datamodel: self.MAPPED_EVENTTYPE_SEARCH.format(
+                datamodel=datamodel,
+                where=self.DATA_MODEL_CONSTRAINTS.get(datamodel, ""),
+            )
+            for datamodel in data_models
+        }
+        search = "\n".join(searches.values())
         record_property("search", search)
 
-        results = list(splunk_search_util.getFieldValuesList(search, INTERVAL, RETRIES))
+        dm_results, failed_data_models = self._run_searches(
+            splunk_search_util, searches
+        )
+        if failed_data_models:
+            # Dispatch the failed searches once more
+            retried_results, failed_data_models = self._run_searches(
+                splunk_search_util,
+                {datamodel: searches[datamodel] for datamodel in failed_data_models},
+            )
+            dm_results.update(retried_results)
+
+        eventtype_data_models = {}
+        for datamodel, each_results in sorted(dm_results.items()):
+            for each_result in each_results.iter_event_views():
+                eventtype = str(each_result["eventtype"])
+                if eventtype != "err0r":
+                    eventtype_data_models.setdefault(eventtype, []).append(datamodel)
+        results = [
+            {
+                "datamodel_count": len(mapped_data_models),
+                "eventtype": eventtype,
+                "datamodels": ", ".join(mapped_data_models),
+            }
+            for eventtype, mapped_data_models in sorted(eventtype_data_models.items())
+            if len(mapped_data_models) > 1
+        ]
         if results:
             record_property("results", results)
             result_str = FieldTestHelper.get_table_output(
@@ -194,13 +250,73 @@ class CIMTestTemplates(object):
                     for each_result in results
                 ],
             )
+        if failed_data_models:
+            record_property("failed_datamodels", failed_data_models)
+            failed_str = FieldTestHelper.get_table_output(
+                headers=["Datamodel", "Error"],
+                value_list=[
+                    [datamodel, error]
+                    for datamodel, error in sorted(failed_data_models.items())
+                ],
+            )
 
+        assert not failed_data_models, (
+            "The search failed for some data models, the eventtypes mapped with"
+            f" them could not be checked.\nsearch=\n{search} \n \n{failed_str}"
+        )
         assert not results, (
             "Multiple data models are mapped with an eventtype"
             f"\nQuery result greater than 0.\nsearch=\n{search} \n \n"
             f"Event type which associated with multiple data model \n{result_str}"
         )
 
+    @staticmethod
+    def _run_searches(search_util, searches):
+        """
+        Dispatch the search of each data model without waiting for the others.
+        A data model without events has no results, the search is not retried.
+
+        Args:
+            search_util (SearchUtil): Object that helps to search on Splunk.
+            searches (dict): data model mapped with its search query
+
+        Returns:
+            tuple: (results, errors), the data models mapped with the results
+                of their search & the data models mapped with the error of
+                their failed search
+        """
+        futures = {
+            datamodel: search_util.submit(each_search)
+            for datamodel, each_search in searches.items()
+        }
+        results = {}
+        errors = {}
+        for datamodel, each_future in futures.items():
+            try:
+                results[datamodel] = search_util.gather([each_future])[0]
+            except Exception as e:
+                errors[datamodel] = str(e)
+        return results, errors
+
+    def _get_installed_data_models(self, search_util):
+        """
+        Get the data models installed on the search head
+
+        Args:
+            search_util (SearchUtil): Object that helps to search on Splunk.
+
+        Returns:
+            set: names of the data models. None if they could not be found.
+        """
+        try:
+            results = search_util.gather(
+                [search_util.submit(self.INSTALLED_DATA_MODELS_SEARCH)]
+            )[0]
+        except Exception as e:
+            self.logger.warning("Could not get the installed data models: %s", e)
+            return None
+        return {str(each_result["title"]) for each_result in results.iter_event_views()}
+
 
     @pytest.mark.splunk_searchtime_cim
     @pytest.mark.splunk_searchtime_cim_fields_not_allowed_in_search
@@ -0,0 +1,331 @@
+# -*- coding: utf-8 -*-
+"""
+Provides the coverage table of the indexed events. The event counts of the
+field, tag and eventtype test cases are computed with one search per stanza
+and stored in a local SQLite file, from which the test cases are answered.
+"""
+import sqlite3
+import logging
+
+from .fields_tests import FieldBatchSearch
+from .index_scope import IndexScope
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+
+
+class CoverageTable(object):
+    """
+    Stores the event count of each test case by sourcetype & source::
+
+        coverage(namespace, kind, stanza, name, sourcetype, source, event_count)
+
+    * field: stanza is <stanza_type>="<stanza>", name is the condition of
+      the positive field test case. The stanza test case has no condition.
+    * tag: stanza is the tag stanza, name is the tag
+    * eventtype: stanza is "eventtype", name is the eventtype
+
+    The searches of the stanzas are planned with the test cases of the
+    session. The warm-up executes the searches concurrently, a stanza which
+    is not warmed up yet is searched when its first test case asks for it.
+    The stanzas already in the table are not searched again, so the table
+    can be reused by the next sessions. The rows are kept per namespace,
+    made of the Splunk instance and the fingerprint of the add-on, so the
+    counts of another instance or another build of the add-on are never
+    used. The file must be removed if the indexed data changes.
+
+    Only the events found are trusted, a test case with no events in the
+    table executes its own search with retries.
+
+    Args:
+        db_path (str): path of the SQLite file
+        search_util (SearchUtil): the util class to search on the Splunk instance
+        interval (int): at what interval each retry should be made
+        retries (int): number of retries to make if no results found
+        index_scope (IndexScope): the indexes of the sourcetypes (optional)
+        namespace (str): namespace of the rows, Ex, host:port & the add-on fingerprint
+    """
+
+    FIELD = "field"
+    TAG = "tag"
+    EVENTTYPE = "eventtype"
+    # Bumped when the tables change, the tables of another version are rebuilt
+    SCHEMA_VERSION = 2
+    TAG_SEARCH = (
+        "search {index_filter} {tag_stanza}"
+        " | stats count by tag, sourcetype, source"
+    )
+    EVENTTYPE_SEARCH = (
+        "search (index=_internal OR index=*) eventtype=*"
+        " | stats count by eventtype, sourcetype, source"
+    )
+
+    def __init__(
+        self,
+        db_path,
+        search_util,
+        interval=3,
+        retries=3,
+        index_scope=None,
+        namespace="",
+    ):
+        self.db_path = db_path
+        self.namespace = namespace
+        self.search_util = search_util
+        self.interval = interval
+        self.retries = retries
+        self.index_scope = index_scope or IndexScope()
+        # (kind, stanza) -> (search, function to parse the results into rows)
+        self._plan = {}
+        self._field_conditions = {}
+        # stanzas searched in the session
+        self._searched = set()
+        self.connection = sqlite3.connect(db_path, timeout=60)
+        with self.connection:
+            (schema_version,) = self.connection.execute(
+                "PRAGMA user_version"
+            ).fetchone()
+            if schema_version != self.SCHEMA_VERSION:
+                self.connection.execute("DROP TABLE IF EXISTS coverage")
+                self.connection.execute("DROP TABLE IF EXISTS stanzas")
+                self.connection.execute(
+                    f"PRAGMA user_version = {self.SCHEMA_VERSION}"
+                )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS coverage (namespace TEXT, kind TEXT,"
+                " stanza TEXT, name TEXT, sourcetype TEXT, source TEXT,"
+                " event_count INTEGER,"
+                " PRIMARY KEY (namespace, kind, stanza, name, sourcetype, source))"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS stanzas (namespace TEXT, kind TEXT,"
+                " stanza TEXT, PRIMARY KEY (namespace, kind, stanza))"
+            )
+
+    def add_field_test(self, test_param):
+        """
+        Plan the search of the stanza of a positive field test case
+
+        Args:
+            test_param (dict): parameter of splunk_searchtime_fields_positive
+        """
+        stanza_key = (test_param["stanza_type"], test_param["stanza"])
+        conditions = self._field_conditions.setdefault(stanza_key, [])
+        condition = FieldBatchSearch.get_condition(test_param["fields"])
+        if condition and condition not in conditions:
+            conditions.append(condition)
+        # The plan is made again with all the conditions of the stanza
+        self._plan[(self.FIELD, self._get_field_stanza(test_param))] = (
+            FieldBatchSearch.make_search_query(
+                stanza_key,
+                conditions,
+                self.index_scope.get_stanza_index_filter(*stanza_key),
+            ),
+            lambda results: self._parse_field_results(conditions, results),
+        )
+
+    def add_tag_test(self, test_param):
+        """
+        Plan the search of the stanza of a tag test case
+
+        Args:
+            test_param (dict): parameter of splunk_searchtime_fields_tags
+        """
+        self._plan.setdefault(
+            (self.TAG, test_param["stanza"]),
+            (
+                self.TAG_SEARCH.format(
+                    index_filter=self.index_scope.get_search_index_filter(
+                        test_param["stanza"]
+                    ),
+                    tag_stanza=test_param["stanza"],
+                ),
+                lambda results: self._parse_results(self.TAG, results),
+            ),
+        )
+
+    def add_eventtype_test(self, test_param):
+        """
+        Plan the search of all the eventtypes
+
+        Args:
+            test_param (dict): parameter of splunk_searchtime_fields_eventtypes
+        """
+        self._plan.setdefault(
+            (self.EVENTTYPE, self.EVENTTYPE),
+            (
+                self.EVENTTYPE_SEARCH,
+                lambda results: self._parse_results(self.EVENTTYPE, results),
+            ),
+        )
+
+    def warm_up(self):
+        """
+        Execute the searches of the planned stanzas which are not in the table.
+        At most max_concurrent_searches of the SearchUtil run at the same time.
+        """
+        stanzas = [
+            each_stanza for each_stanza in self._plan if not self._is_warm(*each_stanza)
+        ]
+        LOGGER.info("Warming up the coverage table for %d stanzas.", len(stanzas))
+        futures = [
+            self.search_util.executor.submit(self._search_stanza, *each_stanza)
+            for each_stanza in stanzas
+        ]
+        for each_stanza, each_future in zip(stanzas, futures):
+            self._store(each_stanza, each_future.result())
+
+    def get_event_count(self, kind, stanza, name):
+        """
+        Get the count of events of a test case. The stanza is searched if it
+        is not in the table yet.
+
+        Args:
+            kind (str): field, tag or eventtype
+            stanza (str): the stanza of the test case
+            name (str): the condition, tag or eventtype of the test case
+
+        Returns:
+            int: count of the events. None if the stanza could not be searched.
+        """
+        if not self._is_warm(kind, stanza):
+            if (kind, stanza) not in self._plan or (kind, stanza) in self._searched:
+                return None
+            self._store((kind, stanza), self._search_stanza(kind, stanza))
+            if not self._is_warm(kind, stanza):
+                return None
+        (event_count,) = self.connection.execute(
+            "SELECT SUM(event_count) FROM coverage"
+            " WHERE namespace = ? AND kind = ? AND stanza = ? AND name = ?",
+            (self.namespace, kind, stanza, name),
+        ).fetchone()
+        return event_count or 0
+
+    def is_field_covered(self, test_param):
+        """
+        Check if the table has events for a positive field test case
+
+        Args:
+            test_param (dict): parameter of splunk_searchtime_fields_positive
+        """
+        return bool(
+            self.get_event_count(
+                self.FIELD,
+                self._get_field_stanza(test_param),
+                FieldBatchSearch.get_condition(test_param["fields"]),
+            )
+        )
+
+    def is_tag_covered(self, test_param):
+        """
+        Check if the table has events for a tag test case
+
+        Args:
+            test_param (dict): parameter of splunk_searchtime_fields_tags
+        """
+        return bool(
+            self.get_event_count(self.TAG, test_param["stanza"], test_param["tag"])
+        )
+
+    def is_eventtype_covered(self, test_param):
+        """
+        Check if the table has events for an eventtype test case
+
+        Args:
+            test_param (dict): parameter of splunk_searchtime_fields_eventtypes
+        """
+        return bool(
+            self.get_event_count(self.EVENTTYPE, self.EVENTTYPE, test_param["stanza"])
+        )
+
+    def close(self):
+        self.connection.close()
+
+    def _search_stanza(self, kind, stanza):
+        """
+        Execute the search of a stanza
+
+        Returns:
+            list: rows of the table. None if the search failed.
+        """
+        self._searched.add((kind, stanza))
+        search, parse_results = self._plan[(kind, stanza)]
+        LOGGER.info("Executing the coverage search query: %s", search)
+        try:
+            return parse_results(
+                self.search_util.getFieldValuesList(
+                    search, interval=self.interval, retries=self.retries
+                )
+            )
+        # The tests fall back to their own search if the stanza is not warm
+        except Exception as e:
+            LOGGER.warning(
+                "Coverage search failed for stanza=%s. error=%s", stanza, str(e)
+            )
+            return None
+
+    def _store(self, stanza_key, rows):
+        # A stanza without events is searched again by the next sessions
+        if not rows:
+            return
+        kind, stanza = stanza_key
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO coverage VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(self.namespace, kind, stanza) + each_row for each_row in rows],
+            )
+            self.connection.execute(
+                "INSERT OR IGNORE INTO stanzas VALUES (?, ?, ?)",
+                (self.namespace, kind, stanza),
+            )
+
+    def _is_warm(self, kind, stanza):
+        return (
+            self.connection.execute(
+                "SELECT 1 FROM stanzas WHERE namespace = ? AND kind = ? AND stanza = ?",
+                (self.namespace, kind, stanza),
+            ).fetchone()
+            is not None
+        )
+
+    @staticmethod
+    def _parse_field_results(conditions, results):
+        rows = []
+        for each_result in results:
+            sourcetype = each_result.get("sourcetype")
+            source = each_result.get("source")
+            rows.append(
+                (
+                    "",
+                    sourcetype,
+                    source,
+                    int(each_result.get(FieldBatchSearch.EVENT_COUNT, 0)),
+                )
+            )
+            for index, each_condition in enumerate(conditions):
+                rows.append(
+                    (
+                        each_condition,
+                        sourcetype,
+                        source,
+                        int(
+                            each_result.get(FieldBatchSearch.TEST_COUNT.format(index), 0)
+                        ),
+                    )
+                )
+        return rows
+
+    @staticmethod
+    def _parse_results(kind, results):
+        return [
+            (
+                each_result.get(kind),
+                each_result.get("sourcetype"),
+                each_result.get("source"),
+                int(each_result.get("count", 0)),
+            )
+            for each_result in results
+        ]
+
+    @staticmethod
+    def _get_field_stanza(test_param):
+        return '{stanza_type}="{stanza}"'.format(**test_param)
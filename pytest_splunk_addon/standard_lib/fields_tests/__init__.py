@@ -6,3 +6,4 @@ Test generation mechanism to verify the field extractions of an Add-on
 from .field_bank import FieldBank
 from .test_generator import FieldTestGenerator
 from .test_templates import FieldTestTemplates
+from .batch_search import FieldBatchSearch
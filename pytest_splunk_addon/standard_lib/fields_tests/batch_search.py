@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+Batches the positive field tests of a stanza into a single search.
+"""
+import re
+import logging
+
+from ..index_scope import DEFAULT_INDEX_FILTER, IndexScope
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+# The field names which can be used in a search without quotes
+FIELD_NAME_REGEX = re.compile(r"^[\w.:-]+$")
+
+
+class FieldBatchSearch(object):
+    """
+    Executes one search per stanza for all the positive field tests
+    collected in the session and caches the event count of each test.
+
+    Instead of dispatching a search for each test case, the conditions
+    of all the test cases of a stanza are folded into a single search::
+
+        search <index_filter> <stanza_type>="<stanza>"
+        | stats count as event_count,
+            count(eval(if(searchmatch("<condition>"), 1, null()))) as test_1,
+            ...
+            by sourcetype, source
+
+    The search of a stanza is executed when the first test of the
+    stanza asks for its event count. It is retried if it finds no
+    events, so the tests take its counts as is, zero included, and
+    search individually only if the batch search failed.
+
+    Args:
+        search_util (SearchUtil): the util class to search on the Splunk instance
+        test_params (list): splunk_searchtime_fields_positive params of the session
+        interval (int): at what interval each retry should be made
+        retries (int): number of retries to make if no results found
+        index_scope (IndexScope): the indexes of the sourcetypes (optional)
+    """
+
+    EVENT_COUNT = "event_count"
+    TEST_COUNT = "test_{}"
+
+    def __init__(
+        self, search_util, test_params, interval=3, retries=3, index_scope=None
+    ):
+        self.search_util = search_util
+        self.interval = interval
+        self.retries = retries
+        self.index_scope = index_scope or IndexScope()
+        self._stanza_conditions = {}
+        self._stanza_counts = {}
+        self._searches = {}
+        for each_param in test_params:
+            self.add_test(each_param)
+
+    def add_test(self, test_param):
+        """
+        Add the condition of a test case to the batch of its stanza
+
+        Args:
+            test_param (dict): parameter of splunk_searchtime_fields_positive
+        """
+        conditions = self._stanza_conditions.setdefault(
+            self._get_stanza_key(test_param), []
+        )
+        condition = self.get_condition(test_param["fields"])
+        if condition and condition not in conditions:
+            conditions.append(condition)
+
+    def get_event_count(self, test_param):
+        """
+        Get the count of events which satisfy the condition of a test case.
+        Executes the batch search of the stanza if not executed already.
+
+        Args:
+            test_param (dict): parameter of splunk_searchtime_fields_positive
+
+        Returns:
+            int: count of the events. None if the test case was not batched
+                or the batch search failed.
+        """
+        stanza_key = self._get_stanza_key(test_param)
+        condition = self.get_condition(test_param["fields"])
+        if stanza_key not in self._stanza_counts:
+            self._stanza_counts[stanza_key] = self._search_stanza(stanza_key)
+        counts = self._stanza_counts[stanza_key]
+        if counts is None:
+            return None
+        return counts.get(condition or self.EVENT_COUNT)
+
+    def get_search(self, test_param):
+        """
+        Get the batch search executed for the stanza of a test case
+
+        Args:
+            test_param (dict): parameter of splunk_searchtime_fields_positive
+
+        Returns:
+            str: the batch search. None if not executed yet.
+        """
+        return self._searches.get(self._get_stanza_key(test_param))
+
+    def _search_stanza(self, stanza_key):
+        """
+        Execute the batch search of a stanza
+
+        Args:
+            stanza_key (tuple): (stanza_type, stanza)
+
+        Returns:
+            dict: condition mapped with the count of events. None if the
+                search failed.
+        """
+        conditions = self._stanza_conditions.get(stanza_key, [])
+        search = self.make_search_query(
+            stanza_key, conditions, self.index_scope.get_stanza_index_filter(*stanza_key)
+        )
+        self._searches[stanza_key] = search
+        LOGGER.info("Executing the batch search query: %s", search)
+        counts = {self.EVENT_COUNT: 0}
+        counts.update({each_condition: 0 for each_condition in conditions})
+        try:
+            results = self.search_util.getFieldValuesList(
+                search, interval=self.interval, retries=self.retries
+            )
+            for each_result in results:
+                counts[self.EVENT_COUNT] += int(each_result.get(self.EVENT_COUNT, 0))
+                for index, each_condition in enumerate(conditions):
+                    counts[each_condition] += int(
+                        each_result.get(self.TEST_COUNT.format(index), 0)
+                    )
+        # The tests fall back to their own search if the batch fails
+        except Exception as e:
+            LOGGER.warning(
+                "Batch search failed for stanza=%s. error=%s", stanza_key[1], str(e)
+            )
+            return None
+        return counts
+
+    @classmethod
+    def make_search_query(cls, stanza_key, conditions, index_filter=DEFAULT_INDEX_FILTER):
+        """
+        Make the batch search query for the conditions of a stanza.
+        The count of the i-th condition is in the test_i column.
+
+        Args:
+            stanza_key (tuple): (stanza_type, stanza)
+            conditions (list): conditions of the test cases of the stanza
+            index_filter (str): the indexes to search
+        """
+        search = cls.get_base_search(*stanza_key, index_filter=index_filter)
+        search += f" | stats count as {cls.EVENT_COUNT}"
+        for index, each_condition in enumerate(conditions):
+            escaped_condition = each_condition.replace("\\", "\\\\").replace(
+                '"', '\\"'
+            )
+            search += (
+                f', count(eval(if(searchmatch("{escaped_condition}"), 1, null())))'
+                f" as {cls.TEST_COUNT.format(index)}"
+            )
+        search += " by sourcetype, source"
+        return search
+
+    @staticmethod
+    def get_base_search(stanza_type, stanza, index_filter=DEFAULT_INDEX_FILTER):
+        """
+        Get the search which finds the events of a stanza
+
+        Args:
+            stanza_type (str): source or sourcetype
+            stanza (str): name of the source or sourcetype
+            index_filter (str): the indexes to search, See IndexScope
+        """
+        return f'search {index_filter} {stanza_type}="{stanza}"'
+
+    @staticmethod
+    def get_condition(fields):
+        """
+        Get the search condition which checks the expected & negative
+        values of the fields
+
+            (field IN (<expected_values>) AND NOT field IN (<negative_values>))
+
+        The values & the field names with spaces or quotes are quoted.
+
+        Args:
+            fields (list): list of addon_parser.Field
+
+        Returns:
+            str: conditions of all the fields joined with AND
+        """
+        condition = []
+        for field in fields:
+            field_name = FieldBatchSearch.get_field_name(field)
+            expected_values = ", ".join(
+                FieldBatchSearch.quote(each) for each in field.expected_values
+            )
+            negative_values = ", ".join(
+                FieldBatchSearch.quote(each) for each in field.negative_values
+            )
+            condition.append(
+                f"({field_name} IN ({expected_values})"
+                f" AND NOT {field_name} IN ({negative_values}))"
+            )
+        return " AND ".join(condition)
+
+    @staticmethod
+    def get_field_name(field):
+        """
+        Get the name of a field to use in a search, quoted if needed
+
+        Args:
+            field (addon_parser.Field): the field
+        """
+        field_name = str(field)
+        if FIELD_NAME_REGEX.match(field_name):
+            return field_name
+        return FieldBatchSearch.quote(field_name)
+
+    @staticmethod
+    def quote(value):
+        """
+        Quote a value for a search, the double quotes in it are escaped
+
+        Args:
+            value (str): the value
+        """
+        return '"{}"'.format(str(value).replace('"', '\\"'))
+
+    @staticmethod
+    def _get_stanza_key(test_param):
+        return (test_param["stanza_type"], test_param["stanza"])
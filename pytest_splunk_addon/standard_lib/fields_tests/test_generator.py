@@ -23,11 +23,12 @@ class FieldTestGenerator(object):
     Args:
         app_path (str): Path of the app package
         field_bank (str): Path of the fields Json file 
+        cache (_pytest.cacheprovider.Cache): The pytest cache to persist the parsed add-on
     """
 
-    def __init__(self, app_path, field_bank=None):
+    def __init__(self, app_path, field_bank=None, cache=None):
         LOGGER.debug("initializing AddonParser to parse the app")
-        self.addon_parser = AddonParser(app_path)
+        self.addon_parser = AddonParser(app_path, cache=cache)
         self.field_bank = field_bank
 
 
@@ -81,10 +82,10 @@ class FieldTestGenerator(object):
 
             # Generate a test case for all the fields in the classname 
             if self._contains_classname(fields_group, ["EXTRACT", "REPORT", "LOOKUP"]):
-                # ACD-4136: Convert the Field objects to dictionary to resolve the shared
-                # memory issue with pytest-xdist parallel execution
+                # ACD-4136: The Field objects are immutable and shared from the
+                # field catalog, the test cases can not modify each other's fields
                 test_group = fields_group.copy()
-                test_group["fields"] = [each.__dict__ for each in test_group["fields"]]
+                test_group["fields"] = list(test_group["fields"])
                 yield pytest.param( 
                     test_group,
                     id="{stanza}::{classname}".format(**test_group)
@@ -98,10 +99,8 @@ class FieldTestGenerator(object):
             # Generate test-cases for each field in classname one by one 
             for each_field in fields_group["fields"]:
                 # Create a dictionary for a single field with classname and stanza
-                # ACD-4136: Convert the Field object to dictionary to resolve the shared
-                # memory issue with pytest-xdist parallel execution
                 one_field_group = fields_group.copy()
-                one_field_group["fields"] = [each_field.__dict__]
+                one_field_group["fields"] = [each_field]
                 if fields_group["classname"] != "field_bank":
                     test_type = "field"
                 else:
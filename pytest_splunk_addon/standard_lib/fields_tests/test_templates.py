@@ -5,7 +5,7 @@ Includes the test scenarios to check the field extractions of an Add-on.
 import pprint
 import logging
 import pytest
-from ..addon_parser import Field
+from .batch_search import FieldBatchSearch
 
 INTERVAL = 3
 RETRIES = 3
@@ -33,9 +33,9 @@ class FieldTestTemplates(object):
         record_property("search", search)
         result, results = splunk_search_util.checkQueryCountIsZero(search)
         if not result:
-            record_property("results", results.as_list)
+            record_property("results", results.to_list())
             pp = pprint.PrettyPrinter(indent=4)
-            result_str = pp.pformat(results.as_list[:10])
+            result_str = pp.pformat(results.to_list(10))
         assert result, (
             f"Query result greater than 0.\nsearch={search}\n"
             f"found result={result_str}"
@@ -44,13 +44,22 @@ class FieldTestTemplates(object):
     @pytest.mark.splunk_searchtime_fields
     @pytest.mark.splunk_searchtime_fields_positive
     def test_props_fields(
-        self, splunk_search_util, splunk_searchtime_fields_positive, record_property
+        self,
+        splunk_search_util,
+        splunk_field_batch,
+        splunk_coverage_table,
+        splunk_index_scope,
+        splunk_searchtime_fields_positive,
+        record_property,
     ):
         """
         This test case checks that a field value has the expected values.
 
         Args:
             splunk_search_util (SearchUtil): Object that helps to search on Splunk.
+            splunk_field_batch (FieldBatchSearch): Batch search of the stanza fields.
+            splunk_coverage_table (CoverageTable): Coverage table of the events (optional).
+            splunk_index_scope (IndexScope): Indexes of the sourcetypes.
             splunk_searchtime_fields_positive (fixture): Test for stanza field.
             record_property (fixture): Document facts of test cases.
             caplog (fixture): fixture to capture logs.
@@ -59,29 +68,51 @@ class FieldTestTemplates(object):
         # Search Query 
         record_property("stanza_name", splunk_searchtime_fields_positive["stanza"])
         record_property("stanza_type", splunk_searchtime_fields_positive["stanza_type"])
-        record_property("fields", splunk_searchtime_fields_positive["fields"])
-
-        search = (
-            f"search (index=_internal OR index=*)"
-            f" {splunk_searchtime_fields_positive['stanza_type']}=\""
-            f"{splunk_searchtime_fields_positive['stanza']}\""
+        record_property(
+            "fields",
+            [each.to_dict() for each in splunk_searchtime_fields_positive["fields"]],
         )
-        for field_dict in splunk_searchtime_fields_positive["fields"]:
-            field = Field(field_dict)
-            expected_values = ", ".join([f'"{each}"' for each in field.expected_values])
-            negative_values = ", ".join([f'"{each}"' for each in field.negative_values])
-
-            search = (
-                search + f" AND ({field} IN ({expected_values})"
-                f" AND NOT {field} IN ({negative_values}))"
-            )
-
-        self.logger.info(f"Executing the search query: {search}")
 
-        # run search
-        result = splunk_search_util.checkQueryCountIsGreaterThanZero(
-            search, interval=INTERVAL, retries=RETRIES
+        search = FieldBatchSearch.get_base_search(
+            splunk_searchtime_fields_positive["stanza_type"],
+            splunk_searchtime_fields_positive["stanza"],
+            splunk_index_scope.get_stanza_index_filter(
+                splunk_searchtime_fields_positive["stanza_type"],
+                splunk_searchtime_fields_positive["stanza"],
+            ),
         )
+        condition = FieldBatchSearch.get_condition(
+            splunk_searchtime_fields_positive["fields"]
+        )
+        if condition:
+            search += f" AND {condition}"
+
+        # The coverage table & the batch search of the stanza cover all the positive tests.
+        # The batch search is retried if it finds no events, its count is final.
+        # Search individually with retries only if the batch search failed
+        result = None
+        if splunk_coverage_table is not None and splunk_coverage_table.is_field_covered(
+            splunk_searchtime_fields_positive
+        ):
+            result = True
+            record_property("coverage_table", splunk_coverage_table.db_path)
+        else:
+            event_count = splunk_field_batch.get_event_count(
+                splunk_searchtime_fields_positive
+            )
+            if event_count is not None:
+                result = event_count > 0
+                record_property(
+                    "batch_search",
+                    splunk_field_batch.get_search(splunk_searchtime_fields_positive),
+                )
+        if result is None:
+            self.logger.info(f"Executing the search query: {search}")
+
+            # run search
+            result = splunk_search_util.checkQueryCountIsGreaterThanZero(
+                search, interval=INTERVAL, retries=RETRIES
+            )
         record_property("search", search)
 
         assert result, (
@@ -92,7 +123,11 @@ class FieldTestTemplates(object):
     @pytest.mark.splunk_searchtime_fields
     @pytest.mark.splunk_searchtime_fields_negative
     def test_props_fields_no_dash_not_empty(
-        self, splunk_search_util, splunk_searchtime_fields_negative, record_property
+        self,
+        splunk_search_util,
+        splunk_index_scope,
+        splunk_searchtime_fields_negative,
+        record_property,
     ):
         """
         This test case checks negative scenario for the field value.
@@ -100,6 +135,8 @@ class FieldTestTemplates(object):
         Args:
             splunk_search_util (SearchUtil): 
                 Object that helps to search on Splunk.
+            splunk_index_scope (IndexScope): 
+                Indexes of the sourcetypes.
             splunk_searchtime_fields_negative (fixture): 
                 Test for stanza field.
             record_property (fixture): 
@@ -111,20 +148,29 @@ class FieldTestTemplates(object):
         # Search Query 
         record_property("stanza_name", splunk_searchtime_fields_negative["stanza"])
         record_property("stanza_type", splunk_searchtime_fields_negative["stanza_type"])
-        record_property("fields", splunk_searchtime_fields_negative["fields"])
+        record_property(
+            "fields",
+            [each.to_dict() for each in splunk_searchtime_fields_negative["fields"]],
+        )
 
-        search = (
-            f"search (index=_internal OR index=*)"
-            f" {splunk_searchtime_fields_negative['stanza_type']}=\""
-            f"{splunk_searchtime_fields_negative['stanza']}\""
+        search = FieldBatchSearch.get_base_search(
+            splunk_searchtime_fields_negative["stanza_type"],
+            splunk_searchtime_fields_negative["stanza"],
+            splunk_index_scope.get_stanza_index_filter(
+                splunk_searchtime_fields_negative["stanza_type"],
+                splunk_searchtime_fields_negative["stanza"],
+            ),
         )
 
         fields_search = []
-        for field_dict in splunk_searchtime_fields_negative["fields"]:
-            field = Field(field_dict)
-            negative_values = ", ".join([f'"{each}"' for each in field.negative_values])
+        for field in splunk_searchtime_fields_negative["fields"]:
+            negative_values = ", ".join(
+                FieldBatchSearch.quote(each) for each in field.negative_values
+            )
 
-            fields_search.append(f"({field} IN ({negative_values}))")
+            fields_search.append(
+                f"({FieldBatchSearch.get_field_name(field)} IN ({negative_values}))"
+            )
         search += " AND ({})".format(" OR ".join(fields_search))
         self.logger.info(f"Executing the search query: {search}")
 
@@ -132,9 +178,9 @@ class FieldTestTemplates(object):
         result, results = splunk_search_util.checkQueryCountIsZero(search)
         record_property("search", search)
         if not result:
-            record_property("results", results.as_list)
+            record_property("results", results.to_list())
             pp = pprint.PrettyPrinter(indent=4)
-            result_str = pp.pformat(results.as_list[:10])
+            result_str = pp.pformat(results.to_list(10))
         assert result, (
             f"Query result greater than 0.\nsearch={search}\n"
             f"found result={result_str}"
@@ -143,7 +189,13 @@ class FieldTestTemplates(object):
     @pytest.mark.splunk_searchtime_fields
     @pytest.mark.splunk_searchtime_fields_tags
     def test_tags(
-        self, splunk_search_util, splunk_searchtime_fields_tags, record_property, caplog
+        self,
+        splunk_search_util,
+        splunk_coverage_table,
+        splunk_index_scope,
+        splunk_searchtime_fields_tags,
+        record_property,
+        caplog,
     ):
         """
         Test case to check tags mentioned in tags.conf
@@ -154,6 +206,8 @@ class FieldTestTemplates(object):
         Args:
             splunk_search_util (helmut_lib.SearchUtil.SearchUtil): 
                 object that helps to search on Splunk.
+            splunk_coverage_table (CoverageTable): Coverage table of the events (optional).
+            splunk_index_scope (IndexScope): Indexes of the sourcetypes.
             splunk_searchtime_fields_tags (fixture): pytest parameters to test.
             record_property (fixture): pytest fixture to document facts of test cases.
             caplog (fixture): fixture to capture logs.
@@ -169,12 +223,20 @@ class FieldTestTemplates(object):
         record_property("tag", tag)
         record_property("is_tag_enabled", is_tag_enabled)
 
-        search = f"search (index=* OR index=_internal) {tag_query} AND tag={tag}"
+        index_filter = splunk_index_scope.get_search_index_filter(tag_query)
+        search = f"search {index_filter} {tag_query} AND tag={tag}"
         self.logger.info(f"Search: {search}")
 
-        result = splunk_search_util.checkQueryCountIsGreaterThanZero(
-            search, interval=INTERVAL, retries=RETRIES
+        result = (
+            splunk_coverage_table is not None
+            and splunk_coverage_table.is_tag_covered(splunk_searchtime_fields_tags)
         )
+        if result:
+            record_property("coverage_table", splunk_coverage_table.db_path)
+        else:
+            result = splunk_search_util.checkQueryCountIsGreaterThanZero(
+                search, interval=INTERVAL, retries=RETRIES
+            )
 
         record_property("search", search)
 
@@ -189,6 +251,7 @@ class FieldTestTemplates(object):
     def test_eventtype(
         self,
         splunk_search_util,
+        splunk_coverage_table,
         splunk_searchtime_fields_eventtypes,
         record_property,
         caplog,
@@ -198,6 +261,8 @@ class FieldTestTemplates(object):
         Args:
             splunk_search_util (fixture): 
                 Fixture to create a simple connection to Splunk via SplunkSDK
+            splunk_coverage_table (fixture): 
+                Coverage table of the events (optional)
             splunk_searchtime_fields_eventtypes (fixture): 
                 Fixture containing list of eventtypes
             record_property (fixture): 
@@ -220,10 +285,19 @@ class FieldTestTemplates(object):
 
         self.logger.info("Search query for testing =%s", search)
 
-        # run search
-        result = splunk_search_util.checkQueryCountIsGreaterThanZero(
-            search, interval=INTERVAL, retries=RETRIES
+        result = (
+            splunk_coverage_table is not None
+            and splunk_coverage_table.is_eventtype_covered(
+                splunk_searchtime_fields_eventtypes
+            )
         )
+        if result:
+            record_property("coverage_table", splunk_coverage_table.db_path)
+        else:
+            # run search
+            result = splunk_search_util.checkQueryCountIsGreaterThanZero(
+                search, interval=INTERVAL, retries=RETRIES
+            )
         record_property("search", search)
         assert result, (
             f"No result found for the search.\nsearch={search}\n"
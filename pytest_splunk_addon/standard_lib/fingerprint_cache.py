@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Provides the base of the pytest cache entries validated with the
+fingerprint of the files they are built from.
+"""
+import os
+import hashlib
+
+
+class FingerprintCache(object):
+    """
+    Stores an entry built from the files of a directory in the pytest cache.
+    The key of the entry is made of the absolute path of the directory.
+
+    The fingerprint of a file is its mtime and the hash of its content.
+    A file is considered unchanged if its mtime is the same or, if the
+    mtime changed, the hash of its content is the same.
+
+    Args:
+        cache (_pytest.cacheprovider.Cache): The pytest cache (config.cache)
+        base_path (str): path of the directory of the files
+    """
+
+    CACHE_KEY = "pytest-splunk-addon/{}"
+    VERSION = 1
+
+    def __init__(self, cache, base_path):
+        self.cache = cache
+        self.base_path = base_path
+        self.key = self.CACHE_KEY.format(
+            hashlib.sha1(os.path.abspath(base_path).encode("utf-8")).hexdigest()
+        )
+
+    @property
+    def version(self):
+        """
+        Version of the entry, the entries of another version are not loaded
+        """
+        return self.VERSION
+
+    def load_entry(self):
+        """
+        Load the entry from the pytest cache
+
+        Returns:
+            dict: the entry. None if it is not cached or of another version.
+        """
+        entry = self.cache.get(self.key, None)
+        if not entry or entry.get("version") != self.version:
+            return None
+        return entry
+
+    def save_entry(self, entry):
+        """
+        Save the entry to the pytest cache
+
+        Args:
+            entry (dict): the entry, must be JSON serializable
+        """
+        self.cache.set(self.key, dict(entry, version=self.version))
+
+    def get_fingerprint(self, file_path):
+        """
+        Get the fingerprint of a file
+
+        Args:
+            file_path (str): path of the file, relative to base_path
+
+        Returns:
+            list: [mtime, hash] of the file
+        """
+        return [self.get_mtime(file_path), self.get_hash(file_path)]
+
+    def is_unchanged(self, file_path, fingerprint):
+        """
+        Check if a file is unchanged since its fingerprint was taken
+
+        Args:
+            file_path (str): path of the file, relative to base_path
+            fingerprint (list): [mtime, hash] of the file
+        """
+        mtime, file_hash = fingerprint
+        return (
+            self.get_mtime(file_path) == mtime or self.get_hash(file_path) == file_hash
+        )
+
+    def get_mtime(self, file_path):
+        return os.stat(os.path.join(self.base_path, file_path)).st_mtime_ns
+
+    def get_hash(self, file_path):
+        with open(os.path.join(self.base_path, file_path), "rb") as file_obj:
+            return hashlib.sha1(file_obj.read()).hexdigest()
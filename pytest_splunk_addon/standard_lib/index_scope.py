@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Provides the indexes to search for the events of a sourcetype.
+"""
+import re
+import logging
+
+LOGGER = logging.getLogger("pytest-splunk-addon")
+
+# The indexes searched if the indexes of the events are not known
+DEFAULT_INDEX_FILTER = "(index=_internal OR index=*)"
+SOURCETYPE_STANZA_REGEX = re.compile(r'^\s*sourcetype\s*=\s*"?([^"\s]+)"?\s*$')
+
+
+class IndexScope(object):
+    """
+    Maps the sourcetypes with the indexes which hold their events, so that
+    the searches of a sourcetype name its indexes instead of scanning
+    every index of the Splunk instance.
+
+    The searches of the sourcetypes which are not mapped and the searches
+    which are not limited to a sourcetype use DEFAULT_INDEX_FILTER.
+
+    Args:
+        sourcetype_indexes (dict): sourcetype mapped with the list of its indexes
+    """
+
+    DISCOVERY_QUERY = (
+        "| tstats count where (index=* OR index=_internal) by index, sourcetype"
+    )
+
+    def __init__(self, sourcetype_indexes=None):
+        # The sourcetypes are matched case insensitively like in the searches
+        self.sourcetype_indexes = {}
+        for sourcetype, indexes in (sourcetype_indexes or {}).items():
+            self.sourcetype_indexes.setdefault(sourcetype.lower(), set()).update(indexes)
+        for sourcetype, indexes in self.sourcetype_indexes.items():
+            self.sourcetype_indexes[sourcetype] = sorted(indexes)
+
+    @classmethod
+    def discover(cls, search_util):
+        """
+        Find the indexes of each sourcetype with a single tstats search
+
+        Args:
+            search_util (SearchUtil): the util class to search on the Splunk instance
+
+        Returns:
+            IndexScope: the indexes of the sourcetypes.
+                Not limited to any index if the search fails.
+        """
+        sourcetype_indexes = {}
+        try:
+            for each_result in search_util.getFieldValuesList(
+                cls.DISCOVERY_QUERY, interval=0, retries=0
+            ):
+                sourcetype_indexes.setdefault(each_result["sourcetype"], []).append(
+                    each_result["index"]
+                )
+        except Exception as e:
+            LOGGER.warning("Could not find the indexes of the sourcetypes: %s", e)
+            return cls()
+        LOGGER.info(
+            "Found the indexes of %d sourcetypes.", len(sourcetype_indexes)
+        )
+        return cls(sourcetype_indexes)
+
+    def get_index_filter(self, sourcetype=None):
+        """
+        Get the index filter for the events of a sourcetype
+
+            (index=<index1> OR index=<index2>)
+
+        Args:
+            sourcetype (str): name of the sourcetype
+
+        Returns:
+            str: the index filter. DEFAULT_INDEX_FILTER if the sourcetype is not mapped.
+        """
+        indexes = self.sourcetype_indexes.get((sourcetype or "").lower())
+        if not indexes:
+            return DEFAULT_INDEX_FILTER
+        return "({})".format(
+            " OR ".join(f'index="{each_index}"' for each_index in indexes)
+        )
+
+    def get_stanza_index_filter(self, stanza_type, stanza):
+        """
+        Get the index filter for the events of a props stanza
+
+        Args:
+            stanza_type (str): source or sourcetype
+            stanza (str): name of the source or sourcetype
+        """
+        if stanza_type != "sourcetype":
+            return DEFAULT_INDEX_FILTER
+        return self.get_index_filter(stanza)
+
+    def get_search_index_filter(self, search_terms):
+        """
+        Get the index filter for the events of search terms, Ex, a tag stanza.
+        Only the search terms of a single sourcetype are limited.
+
+        Args:
+            search_terms (str): the search terms. Ex, sourcetype="sample"
+        """
+        match_obj = SOURCETYPE_STANZA_REGEX.match(search_terms)
+        if not match_obj:
+            return DEFAULT_INDEX_FILTER
+        return self.get_index_filter(match_obj.group(1))
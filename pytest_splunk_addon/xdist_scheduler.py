@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Provides the pytest-xdist scheduling which runs the tests of a stanza
+on the same worker.
+
+Dependencies:
+    pytest-xdist: The module should only be imported if xdist is installed
+"""
+import re
+
+from xdist.scheduler import LoadScopeScheduling
+from .standard_lib.fields_tests import FieldTestTemplates
+from .standard_lib.cim_tests import CIMTestTemplates
+
+# {module}::{class}::{test_name}[{param_id}], the templates are test classes
+PARAM_ID_REGEX = re.compile(
+    r"^[^\[]*::[^:\[]+::(?P<test_name>[^:\[]+)\[(?P<param_id>.*)\]$"
+)
+# The props.conf stanzas which include "::", Example: source::{source}
+PREFIXED_STANZAS = ("source", "host")
+# The tests generated by the plugin, the other tests are grouped by xdist
+TEMPLATE_TESTS = frozenset(
+    each_name
+    for each_template in (FieldTestTemplates, CIMTestTemplates)
+    for each_name in dir(each_template)
+    if each_name.startswith("test_")
+)
+
+
+class StanzaScheduling(LoadScopeScheduling):
+    """
+    Distributes the tests by their stanza instead of their module or class.
+
+    The test ids of the test generators start with the stanza of the test,
+    Example: {stanza}, {stanza}::{classname}, {stanza}::field::{field},
+    {tag_stanza}::{data_set}::{field}. All the tests of a stanza search
+    the same events, running them on the same worker lets the worker reuse
+    the per-stanza searches and the search head cache of the events.
+
+    The tests of an eventtype (eventtype::{eventtype}) are grouped with
+    the tests of the eventtype="{eventtype}" tag stanza.
+    The tests which are not generated by the plugin, Example: the tests of
+    the user or the tests which are not parametrized, are grouped by module
+    or class as with LoadScopeScheduling.
+    """
+
+    def _split_scope(self, nodeid):
+        """
+        Determine the scope of a test
+
+        Args:
+            nodeid (str): node id of the test
+
+        Returns:
+            str: the stanza of the test generated by the plugin,
+                the module or class of the other tests
+        """
+        match_obj = PARAM_ID_REGEX.match(nodeid)
+        if not match_obj or match_obj.group("test_name") not in TEMPLATE_TESTS:
+            return super(StanzaScheduling, self)._split_scope(nodeid)
+        param_parts = match_obj.group("param_id").split("::")
+        if len(param_parts) > 1:
+            if param_parts[0] == "eventtype":
+                return 'eventtype="{}"'.format("::".join(param_parts[1:]))
+            if param_parts[0] in PREFIXED_STANZAS:
+                return "::".join(param_parts[:2])
+        return param_parts[0]
@@ -35,11 +35,13 @@ setup(
         "httplib2~=0.17",
         "logutils",
         "requests2~=2.16",
-        "splunk_appinspect>=2.0.1",
         "six",
         "jsonschema~=3.2.0",
     ],
-    extras_require={"docker": ["lovely-pytest-docker>=0.1.0"]},
+    extras_require={
+        "docker": ["lovely-pytest-docker>=0.1.0"],
+        "appinspect": ["splunk_appinspect>=2.0.1"],
+    },
     setup_requires=["pytest-runner"],
     classifiers=[
         "Development Status :: 4 - Beta",
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark of the props.conf field extraction.
+
+Generates an Add-on with a synthetic props.conf of 10k options and times
+PropsParser.get_props_fields over it. The configuration files are read
+before the timer starts, so only the field extraction is measured.
+
+Usage::
+
+    python tests/benchmark_props_parser.py [--options 10000] [--repeat 5]
+        [--max-seconds <seconds>]
+
+With --max-seconds the script exits with 1 if the best run is slower,
+so that it can guard against regressions.
+"""
+import os
+import sys
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pytest_splunk_addon.standard_lib.addon_parser import ConfParser, PropsParser
+
+# A props option of each supported class and its transforms stanza if any
+OPTION_TEMPLATES = (
+    ("EXTRACT-field_{0}", r"(?<field_{0}>\w+)\s+(?<value_{0}>\d+)", None),
+    ("EVAL-eval_{0}", 'if(isnull(field_{0}), "unknown", field_{0})', None),
+    ("FIELDALIAS-alias_{0}", "field_{0} AS alias_{0} value_{0} ASNEW avalue_{0}", None),
+    (
+        "LOOKUP-lookup_{0}",
+        "lookup_{0} key_{0} AS field_{0} OUTPUTNEW lookup_value_{0}",
+        None,
+    ),
+    (
+        "REPORT-report_{0}",
+        "transform_{0}",
+        "[transform_{0}]\nREGEX = (?<report_{0}>\\w+)=(\\d+)\nFORMAT = name_{0}::$1\n",
+    ),
+)
+OPTIONS_PER_STANZA = 100
+
+
+def generate_addon(addon_path, option_count):
+    """
+    Write the props.conf and transforms.conf of a synthetic Add-on
+
+    Args:
+        addon_path (str): directory of the Add-on
+        option_count (int): number of options in props.conf
+    """
+    default_path = os.path.join(addon_path, "default")
+    os.makedirs(default_path)
+    props_lines = []
+    transforms_lines = []
+    for index in range(option_count):
+        if index % OPTIONS_PER_STANZA == 0:
+            props_lines.append(f"\n[sourcetype_{index // OPTIONS_PER_STANZA}]")
+        name, value, transform = OPTION_TEMPLATES[index % len(OPTION_TEMPLATES)]
+        props_lines.append(f"{name.format(index)} = {value.format(index)}")
+        if transform:
+            transforms_lines.append(transform.format(index))
+    with open(os.path.join(default_path, "props.conf"), "w") as props_file:
+        props_file.write("\n".join(props_lines) + "\n")
+    with open(os.path.join(default_path, "transforms.conf"), "w") as transforms_file:
+        transforms_file.write("\n".join(transforms_lines))
+
+
+def time_props_parser(addon_path):
+    """
+    Time the field extraction of the props.conf of an Add-on
+
+    Returns:
+        tuple: (seconds, count of the props options with fields)
+    """
+    app = ConfParser(addon_path)
+    props_parser = PropsParser(addon_path, app)
+    # Read the configuration files before the timer starts
+    props_parser.props
+    props_parser.transforms_parser.transforms
+    start_time = time.perf_counter()
+    parsed_count = sum(1 for _ in props_parser.get_props_fields())
+    return time.perf_counter() - start_time, parsed_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--options", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None)
+    args = parser.parse_args()
+
+    addon_path = os.path.join(tempfile.mkdtemp(), "TA_benchmark")
+    try:
+        generate_addon(addon_path, args.options)
+        timings = []
+        for _ in range(args.repeat):
+            seconds, parsed_count = time_props_parser(addon_path)
+            timings.append(seconds)
+    finally:
+        shutil.rmtree(os.path.dirname(addon_path))
+
+    best = min(timings)
+    print(
+        f"props options={args.options} parsed={parsed_count}"
+        f" best={best:.3f}s mean={sum(timings) / len(timings):.3f}s"
+    )
+    if args.max_seconds is not None and best > args.max_seconds:
+        print(f"Slower than --max-seconds={args.max_seconds}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
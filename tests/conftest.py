@@ -6,6 +6,7 @@ pytest_plugins = "pytester"
 def pytest_configure(config):
     config.addinivalue_line("markers", "external: Test search time only")
     config.addinivalue_line("markers", "docker: Test search time only")
+    config.addinivalue_line("markers", "unit: Test without a Splunk instance")
 
 
 
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests of the configuration file parser of the add-on.
+Run with: pytest tests/unit -m unit
+"""
+import pytest
+from pytest_splunk_addon.standard_lib.addon_parser import conf_parser
+from pytest_splunk_addon.standard_lib.addon_parser.conf_parser import (
+    ConfParser,
+    parse_conf,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def write_conf(app_path, layer, name, content, encoding="utf-8"):
+    layer_path = app_path.join(layer)
+    layer_path.ensure(dir=True)
+    layer_path.join(name).write_binary(content.encode(encoding))
+
+
+def get_options(stanza):
+    return {name: option.value for name, option in stanza.options.items()}
+
+
+def test_local_layered_over_default(tmpdir):
+    write_conf(
+        tmpdir,
+        "default",
+        "props.conf",
+        "[sample]\nEXTRACT-one = (?<one>\\d+)\nEVAL-two = 2\n",
+    )
+    write_conf(
+        tmpdir,
+        "local",
+        "props.conf",
+        "[sample]\nEVAL-two = 22\n[local_only]\nEVAL-three = 3\n",
+    )
+    props = ConfParser(str(tmpdir)).props_conf()
+    assert list(props.sects) == ["sample", "local_only"]
+    assert get_options(props.sects["sample"]) == {
+        "EXTRACT-one": "(?<one>\\d+)",
+        "EVAL-two": "22",
+    }
+    assert get_options(props.sects["local_only"]) == {"EVAL-three": "3"}
+
+
+def test_local_only(tmpdir):
+    write_conf(tmpdir, "local", "eventtypes.conf", "[et]\nsearch = index=main\n")
+    eventtypes = ConfParser(str(tmpdir)).eventtypes_conf()
+    assert get_options(eventtypes.sects["et"]) == {"search": "index=main"}
+
+
+def test_missing_conf(tmpdir):
+    with pytest.raises(OSError):
+        ConfParser(str(tmpdir)).transforms_conf()
+
+
+def test_line_continuation():
+    conf = parse_conf(
+        [
+            "[sample]\n",
+            "EVAL-multi = if(a, \\\n",
+            "    b, \\\r\n",
+            "    c)\n",
+            "EVAL-next = 1\n",
+        ]
+    )
+    assert get_options(conf.sects["sample"]) == {
+        "EVAL-multi": "if(a, \n    b, \n    c)",
+        "EVAL-next": "1",
+    }
+
+
+def test_default_stanza():
+    conf = parse_conf(
+        [
+            "# comment\n",
+            "TRUNCATE = 0\n",
+            "[default]\n",
+            "SHOULD_LINEMERGE = false\n",
+            "[sample]\n",
+            "EVAL-one = 1\n",
+        ]
+    )
+    assert list(conf.sects) == ["default", "sample"]
+    assert get_options(conf.sects["default"]) == {
+        "TRUNCATE": "0",
+        "SHOULD_LINEMERGE": "false",
+    }
+
+
+def test_comments_and_invalid_stanza():
+    conf = parse_conf(
+        ["[sample]\n", "; comment = 1\n", "[broken\n", "EVAL-one = 1\n", "not a setting\n"]
+    )
+    assert list(conf.sects) == ["sample"]
+    assert get_options(conf.sects["sample"]) == {"EVAL-one": "1"}
+
+
+def test_repeated_stanza_merged():
+    conf = parse_conf(["[a]\n", "x = 1\n", "[b]\n", "[a]\n", "y = 2\n"])
+    assert list(conf.sects) == ["a", "b"]
+    assert get_options(conf.sects["a"]) == {"x": "1", "y": "2"}
+
+
+def test_utf8_bom(tmpdir):
+    write_conf(tmpdir, "default", "tags.conf", "[a]\nb = enabled\n", "utf-8-sig")
+    conf = ConfParser(str(tmpdir)).get_config("tags.conf")
+    assert list(conf.sects) == ["a"]
+
+
+def test_non_utf8_without_appinspect(tmpdir, monkeypatch):
+    write_conf(
+        tmpdir, "default", "props.conf", "[caf\xe9]\nEVAL-x = \xe9\n", "latin-1"
+    )
+
+    def no_appinspect(self):
+        raise ImportError("No module named 'splunk_appinspect'")
+
+    monkeypatch.setattr(ConfParser, "get_appinspect_app", no_appinspect)
+    props = ConfParser(str(tmpdir)).props_conf()
+    assert get_options(props.sects["caf\xe9"]) == {"EVAL-x": "\xe9"}
+
+
+def test_non_utf8_with_appinspect(tmpdir, monkeypatch):
+    write_conf(tmpdir, "default", "props.conf", "[a]\nEVAL-x = \xe9\n", "latin-1")
+    appinspect_conf = conf_parser.ConfFile()
+    appinspect_conf.add_section("from_appinspect")
+
+    class AppinspectApp(object):
+        def get_config(self, name, dir):
+            assert (name, dir) == ("props.conf", "default")
+            return appinspect_conf
+
+    monkeypatch.setattr(ConfParser, "get_appinspect_app", lambda self: AppinspectApp())
+    props = ConfParser(str(tmpdir)).props_conf()
+    assert list(props.sects) == ["from_appinspect"]
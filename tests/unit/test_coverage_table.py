@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests of the coverage table of the indexed events.
+Run with: pytest tests/unit -m unit
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from pytest_splunk_addon.standard_lib.addon_parser import Field
+from pytest_splunk_addon.standard_lib.coverage_table import CoverageTable
+
+pytestmark = pytest.mark.unit
+
+TAG_PARAM = {"stanza": 'sourcetype="test:sourcetype"', "tag": "network"}
+EVENTTYPE_PARAM = {"stanza": "test_eventtype"}
+FIELD_PARAM = {
+    "stanza": "test:sourcetype",
+    "stanza_type": "sourcetype",
+    "fields": [Field({"name": "action"})],
+}
+
+
+class FakeSearchUtil(object):
+    """
+    Answers getFieldValuesList with the events of a Splunk instance and
+    records the searches
+    """
+
+    def __init__(self, tag_count=0, eventtype_count=0, field_count=0):
+        self.executor = ThreadPoolExecutor(max_workers=2)
+        self.searches = []
+        self.results = {
+            "stats count by tag": [
+                {
+                    "tag": "network",
+                    "sourcetype": "test:sourcetype",
+                    "source": "a.log",
+                    "count": str(tag_count),
+                }
+            ],
+            "stats count by eventtype": [
+                {
+                    "eventtype": "test_eventtype",
+                    "sourcetype": "test:sourcetype",
+                    "source": "a.log",
+                    "count": str(eventtype_count),
+                }
+            ],
+            "stats count as event_count": [
+                {
+                    "sourcetype": "test:sourcetype",
+                    "source": "a.log",
+                    "event_count": str(field_count),
+                    "test_0": str(field_count),
+                }
+            ],
+        }
+
+    def getFieldValuesList(self, query, interval, retries):
+        self.searches.append(query)
+        for each_search, each_results in self.results.items():
+            if each_search in query:
+                for each_result in each_results:
+                    if int(each_result.get("count", each_result.get("event_count"))):
+                        yield dict(each_result)
+
+
+def make_table(db_path, search_util, namespace):
+    coverage_table = CoverageTable(db_path, search_util, namespace=namespace)
+    coverage_table.add_tag_test(TAG_PARAM)
+    coverage_table.add_eventtype_test(EVENTTYPE_PARAM)
+    coverage_table.add_field_test(FIELD_PARAM)
+    coverage_table.warm_up()
+    return coverage_table
+
+
+def test_instances_isolated(tmpdir):
+    db_path = str(tmpdir.join("coverage.db"))
+    first_util = FakeSearchUtil(tag_count=2, eventtype_count=3, field_count=4)
+    first_table = make_table(db_path, first_util, "first:8089/addon")
+    second_util = FakeSearchUtil()
+    second_table = make_table(db_path, second_util, "second:8089/addon")
+
+    assert first_table.is_tag_covered(TAG_PARAM)
+    assert first_table.is_eventtype_covered(EVENTTYPE_PARAM)
+    assert first_table.is_field_covered(FIELD_PARAM)
+    assert first_table.get_event_count(
+        CoverageTable.TAG, TAG_PARAM["stanza"], TAG_PARAM["tag"]
+    ) == 2
+    # The rows of the first instance are not used for the second one
+    assert len(second_util.searches) == 3
+    assert not second_table.is_tag_covered(TAG_PARAM)
+    assert not second_table.is_eventtype_covered(EVENTTYPE_PARAM)
+    assert not second_table.is_field_covered(FIELD_PARAM)
+    assert second_table.get_event_count(
+        CoverageTable.TAG, TAG_PARAM["stanza"], TAG_PARAM["tag"]
+    ) is None
+    first_table.close()
+    second_table.close()
+
+
+def test_table_reused_by_namespace(tmpdir):
+    db_path = str(tmpdir.join("coverage.db"))
+    make_table(
+        db_path, FakeSearchUtil(tag_count=2, eventtype_count=3), "first:8089/addon"
+    ).close()
+
+    search_util = FakeSearchUtil()
+    coverage_table = make_table(db_path, search_util, "first:8089/addon")
+    # Only the stanza without events is searched again
+    assert len(search_util.searches) == 1
+    assert "stats count as event_count" in search_util.searches[0]
+    assert coverage_table.is_tag_covered(TAG_PARAM)
+    assert coverage_table.is_eventtype_covered(EVENTTYPE_PARAM)
+    coverage_table.close()
+
+    other_build_util = FakeSearchUtil()
+    make_table(db_path, other_build_util, "first:8089/other_addon").close()
+    assert len(other_build_util.searches) == 3
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests of the batch search of the field tests of a stanza.
+Run with: pytest tests/unit -m unit
+"""
+import pytest
+from pytest_splunk_addon.standard_lib.addon_parser import Field
+from pytest_splunk_addon.standard_lib.fields_tests import FieldBatchSearch
+from pytest_splunk_addon.standard_lib.index_scope import IndexScope
+
+pytestmark = pytest.mark.unit
+
+
+class FakeSearchUtil(object):
+    """
+    Answers getFieldValuesList with the given results and records the searches
+    """
+
+    def __init__(self, results=(), error=None):
+        self.results = results
+        self.error = error
+        self.searches = []
+
+    def getFieldValuesList(self, query, interval, retries):
+        self.searches.append((query, retries))
+        if self.error:
+            raise self.error
+        for each_result in self.results:
+            yield dict(each_result)
+
+
+def make_param(fields, stanza="test:sourcetype", stanza_type="sourcetype"):
+    return {
+        "stanza": stanza,
+        "stanza_type": stanza_type,
+        "fields": [Field(each_field) for each_field in fields],
+    }
+
+
+def test_condition():
+    assert FieldBatchSearch.get_condition(
+        [Field({"name": "action"}), Field({"name": "src.ip"})]
+    ) == (
+        '(action IN ("*") AND NOT action IN ("-", ""))'
+        ' AND (src.ip IN ("*") AND NOT src.ip IN ("-", ""))'
+    )
+
+
+def test_condition_quoted():
+    assert FieldBatchSearch.get_condition(
+        [
+            Field(
+                {
+                    "name": "user name",
+                    "expected_values": ['a "b"'],
+                    "negative_values": ["-"],
+                }
+            ),
+            Field({"name": 'say"hi', "negative_values": []}),
+        ]
+    ) == (
+        '("user name" IN ("a \\"b\\"") AND NOT "user name" IN ("-"))'
+        ' AND ("say\\"hi" IN ("*") AND NOT "say\\"hi" IN ())'
+    )
+
+
+def test_search_query():
+    conditions = [
+        FieldBatchSearch.get_condition([Field({"name": "action"})]),
+        FieldBatchSearch.get_condition(
+            [Field({"name": "user name", "expected_values": ["C:\\Users"]})]
+        ),
+    ]
+    assert FieldBatchSearch.make_search_query(
+        ("sourcetype", "test:sourcetype"), conditions, '(index="main")'
+    ) == (
+        'search (index="main") sourcetype="test:sourcetype"'
+        " | stats count as event_count"
+        ', count(eval(if(searchmatch("(action IN (\\"*\\")'
+        ' AND NOT action IN (\\"-\\", \\"\\"))"), 1, null()))) as test_0'
+        ', count(eval(if(searchmatch("(\\"user name\\" IN (\\"C:\\\\Users\\")'
+        ' AND NOT \\"user name\\" IN (\\"-\\", \\"\\"))"), 1, null()))) as test_1'
+        " by sourcetype, source"
+    )
+
+
+def test_search_query_without_conditions():
+    assert FieldBatchSearch.make_search_query(("source", "/var/log/a.log"), []) == (
+        'search (index=_internal OR index=*) source="/var/log/a.log"'
+        " | stats count as event_count by sourcetype, source"
+    )
+
+
+def test_event_count():
+    stanza_param = make_param([])
+    field_param = make_param([{"name": "action"}])
+    other_param = make_param([{"name": "other"}])
+    search_util = FakeSearchUtil(
+        [
+            {"sourcetype": "test:sourcetype", "event_count": "3", "test_0": "2"},
+            {"sourcetype": "test:sourcetype", "event_count": "4", "test_0": "0"},
+        ]
+    )
+    batch = FieldBatchSearch(
+        search_util,
+        [stanza_param, field_param],
+        index_scope=IndexScope({"test:sourcetype": ["main"]}),
+    )
+    assert batch.get_event_count(stanza_param) == 7
+    assert batch.get_event_count(field_param) == 2
+    assert batch.get_event_count(other_param) is None
+    assert len(search_util.searches) == 1
+    assert batch.get_search(field_param).startswith(
+        'search (index="main") sourcetype="test:sourcetype"'
+    )
+
+
+def test_event_count_zero():
+    field_param = make_param([{"name": "action"}])
+    search_util = FakeSearchUtil()
+    batch = FieldBatchSearch(search_util, [field_param], retries=2)
+    # No results after the retries of the batch search is a final zero
+    assert batch.get_event_count(field_param) == 0
+    assert batch.get_event_count(field_param) == 0
+    assert search_util.searches == [(batch.get_search(field_param), 2)]
+
+
+def test_event_count_failed():
+    field_param = make_param([{"name": "action"}])
+    batch = FieldBatchSearch(FakeSearchUtil(error=RuntimeError("failed")), [field_param])
+    assert batch.get_event_count(field_param) is None
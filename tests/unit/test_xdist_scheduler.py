@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests of the pytest-xdist scheduling of the tests by stanza.
+Run with: pytest tests/unit -m unit
+"""
+import pytest
+
+pytest.importorskip("xdist.scheduler")
+
+from xdist.scheduler import LoadScopeScheduling
+from pytest_splunk_addon.xdist_scheduler import StanzaScheduling
+
+pytestmark = pytest.mark.unit
+
+TEST_CLASS = "tests/test_addon.py::Test_App"
+
+
+@pytest.fixture
+def scheduling():
+    # _split_scope does not need the config & the nodes of the session
+    return StanzaScheduling.__new__(StanzaScheduling)
+
+
+@pytest.mark.parametrize(
+    "nodeid, scope",
+    [
+        (f"{TEST_CLASS}::test_props_fields[test:sourcetype]", "test:sourcetype"),
+        (
+            f"{TEST_CLASS}::test_props_fields[test:sourcetype::EXTRACT-one]",
+            "test:sourcetype",
+        ),
+        (
+            f"{TEST_CLASS}::test_props_fields[host::test::field::one]",
+            "host::test",
+        ),
+        (
+            f"{TEST_CLASS}::test_props_fields_no_dash_not_empty[source::/var/log/a[1]::field::b]",
+            "source::/var/log/a[1]",
+        ),
+        (f"{TEST_CLASS}::test_tags[eventtype=\"test\"::tag::network]", 'eventtype="test"'),
+        (f"{TEST_CLASS}::test_eventtype[eventtype::test]", 'eventtype="test"'),
+        (
+            f"{TEST_CLASS}::test_cim_required_fields[eventtype=\"test\"::Network_Traffic::src]",
+            'eventtype="test"',
+        ),
+    ],
+)
+def test_template_tests_by_stanza(scheduling, nodeid, scope):
+    assert scheduling._split_scope(nodeid) == scope
+
+
+@pytest.mark.parametrize(
+    "nodeid",
+    [
+        f"{TEST_CLASS}::test_splunk_internal_errors",
+        f"{TEST_CLASS}::test_user[test:sourcetype]",
+        f"{TEST_CLASS}::test_user[source::test::field::one]",
+        "tests/test_user.py::test_tags[1]",
+        "tests/test_user.py::TestUser::test_user",
+    ],
+)
+def test_other_tests_by_xdist(scheduling, nodeid):
+    assert scheduling._split_scope(nodeid) == LoadScopeScheduling._split_scope(
+        scheduling, nodeid
+    )